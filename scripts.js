@@ -143,14 +143,40 @@
         // Cache: { repoName: { repoInfo, commits[] } }
         const repoDataCache = {};
 
-        // Load pre-generated stats from GitHub Actions (zero API calls)
-        async function loadStaticStats() {
-            try {
-                const resp = await fetch("data/github-stats.json");
-                if (!resp.ok) return false;
-                const data = await resp.json();
+        // Load pre-generated per-repo shards from GitHub Actions (zero API calls).
+        // The index lists each shard with its content hash, used as a cache key.
+        // Only the repos asked for are fetched: the tree rings load their own
+        // repo when scrolled into view; the heatmap needs them all only when
+        // the rollup is missing.
+        let statsIndex = null; // promise of data/stats/index.json, per init
+
+        function loadStatsIndex() {
+            if (!statsIndex) {
+                statsIndex = fetch("data/stats/index.json")
+                    .then((resp) => (resp.ok ? resp.json() : null))
+                    .catch(() => null);
+            }
+            return statsIndex;
+        }
 
-            for (let [repo, info] of Object.entries(data.repos)) {
+        async function loadStaticStats(repos = REPOS) {
+            try {
+                const data = await loadStatsIndex();
+                if (!data) return false;
+                const wanted = Object.entries(data.shards).filter(([repo]) =>
+                    repos.includes(repo === "MedMod" ? "OpenClinic" : repo),
+                );
+                const shards = await Promise.all(
+                    wanted.map(async ([repo, entry]) => {
+                        const shardResp = await fetch(
+                            `data/stats/${entry.path}?v=${entry.sha256.slice(0, 12)}`,
+                        );
+                        return shardResp.ok ? [repo, await shardResp.json()] : null;
+                    }),
+                );
+                if (!shards.some(Boolean)) return false;
+
+            for (let [repo, info] of shards.filter(Boolean)) {
                 if (repo === "MedMod") repo = "OpenClinic";
                 repoDataCache[repo] = {
                     repoInfo: { created_at: info.created_at },
@@ -164,6 +190,11 @@
                 };
             }
 
+            // Only trust the rollup if it was built from this same snapshot
+            if (heatmapRollup && heatmapRollup.generated !== data.generated) {
+                heatmapRollup = null;
+            }
+
             lastFetchTime = new Date(data.generated);
             dataSource = "json";
             isLiveData = true;
@@ -173,6 +204,22 @@
         }
       }
 
+        // Pre-bucketed daily counts written by fetch_stats.py (small, first paint)
+        let heatmapRollup = null;
+
+        async function loadStatsRollup() {
+            try {
+                const resp = await fetch("data/github-rollup.json");
+                if (!resp.ok) return false;
+                const rollup = await resp.json();
+                if (!rollup.base_date || !rollup.all) return false;
+                heatmapRollup = rollup;
+                return true;
+            } catch (e) {
+                return false;
+            }
+        }
+
         // Rate-limit-aware fetch wrapper for live API
         async function ghFetch(url) {
             if (rateLimitRemaining <= 2) return null;
@@ -229,10 +276,20 @@
           return anySuccess;
       }
 
+        // Heatmap days are UTC calendar days (the rollup buckets by UTC date),
+        // each represented by its UTC midnight and read with getUTC* getters.
+        const DAY_MS = 24 * 60 * 60 * 1000;
+
+        function utcMidnight(date) {
+            return new Date(
+                Date.UTC(date.getUTCFullYear(), date.getUTCMonth(), date.getUTCDate()),
+            );
+        }
+
         // Build heatmap data from shared cache (all-time)
         function buildHeatmapFromCache() {
         const activityMap = new Map();
-        const today = new Date();
+        const today = utcMidnight(new Date());
 
           // Find the earliest commit across all repos
           let earliest = today;
@@ -246,18 +303,15 @@
           }
 
           // Snap to the Sunday of that week
-          const start = new Date(earliest);
-          start.setDate(start.getDate() - start.getDay());
-          start.setHours(0, 0, 0, 0);
+          const first = utcMidnight(earliest);
+          const start = first.getTime() - first.getUTCDay() * DAY_MS;
 
           // Fill every day from start to today
-          const totalDays =
-              Math.ceil((today - start) / (1000 * 60 * 60 * 24)) + 1;
+          const totalDays = Math.round((today - start) / DAY_MS) + 1;
           for (let i = 0; i < totalDays; i++) {
-              const date = new Date(start);
-              date.setDate(date.getDate() + i);
+              const date = new Date(start + i * DAY_MS);
               const dateKey = date.toISOString().split("T")[0];
-              activityMap.set(dateKey, { date: new Date(date), count: 0 });
+              activityMap.set(dateKey, { date, count: 0 });
         }
 
           // Tally commits into the map
@@ -277,10 +331,26 @@
         return Array.from(activityMap.values()).sort((a, b) => a.date - b.date);
       }
 
+        // Build heatmap data from the rollup's all-repo daily counts
+        function buildHeatmapFromRollup(rollup) {
+            const [year, month, day] = rollup.base_date.split("-").map(Number);
+            const start = Date.UTC(year, month - 1, day);
+            const today = utcMidnight(new Date());
+            const totalDays = Math.round((today - start) / DAY_MS) + 1;
+            const data = [];
+            for (let i = 0; i < totalDays; i++) {
+                data.push({
+                    date: new Date(start + i * DAY_MS),
+                    count: rollup.all.daily[i] || 0,
+                });
+            }
+            return data;
+        }
+
         // Deterministic fallback data using KNOWN_REPO_DATA aggregates
         function generateFallbackData() {
         const data = [];
-        const today = new Date();
+        const today = utcMidnight(new Date());
 
           // Deterministic hash (same as tree ring fallback)
           const hash = (str, seed) => {
@@ -299,13 +369,12 @@
           );
 
         for (let i = 364; i >= 0; i--) {
-            const date = new Date(today);
-            date.setDate(date.getDate() - i);
+            const date = new Date(today.getTime() - i * DAY_MS);
             const dateKey = date.toISOString().split("T")[0];
 
             // Hash date string for deterministic activity
             const h = hash(dateKey, 42);
-            const isWeekend = date.getDay() === 0 || date.getDay() === 6;
+            const isWeekend = date.getUTCDay() === 0 || date.getUTCDay() === 6;
             let count = 0;
 
             const roll = h % 100;
@@ -338,8 +407,11 @@
 
         if (!grid) return;
 
-          // Build from cache (already fetched by initAllData)
-          let activityData = buildHeatmapFromCache();
+          // Build from the rollup when showing synced data, else from cache
+          let activityData =
+              dataSource === "json" && heatmapRollup
+                  ? buildHeatmapFromRollup(heatmapRollup)
+                  : buildHeatmapFromCache();
           const totalCommits = activityData.reduce((sum, d) => sum + d.count, 0);
 
           if (totalCommits === 0) {
@@ -352,7 +424,7 @@
 
         // Calculate starting position (find first Sunday)
         const firstDate = activityData[0].date;
-        const startDay = firstDate.getDay();
+        const startDay = firstDate.getUTCDay();
 
         // Create grid with 53 columns (weeks) x 7 rows (days)
         const weeks = [];
@@ -395,6 +467,7 @@
                           month: "short",
                           day: "numeric",
                           year: "numeric",
+                          timeZone: "UTC",
                       }),
                   );
                   cell.setAttribute("data-count", day.count);
@@ -406,6 +479,7 @@
                         month: "short",
                         day: "numeric",
                         year: "numeric",
+                        timeZone: "UTC",
                     },
                 )}`;
             } else {
@@ -439,8 +513,8 @@
         weeks.forEach((week, weekIndex) => {
             const firstValidDay = week.find((d) => d !== null);
             if (firstValidDay) {
-                const month = firstValidDay.date.getMonth();
-                const year = firstValidDay.date.getFullYear();
+                const month = firstValidDay.date.getUTCMonth();
+                const year = firstValidDay.date.getUTCFullYear();
                 if (month !== lastMonth) {
                     const monthLabel = document.createElement("span");
                     // Show year on January or first label
@@ -565,7 +639,21 @@
             if (statusText) statusText.textContent = "Syncing commit history...";
             if (refreshBtn) refreshBtn.classList.add("spinning");
 
-          // Step 1: Try pre-built JSON from GitHub Actions (instant, no rate limit)
+          // Step 1: Paint the heatmap from the small rollup. Per-commit shards
+          // are then only fetched for tree rings as they scroll into view.
+          statsIndex = null;
+          const rollupOk = await loadStatsRollup();
+          if (rollupOk) {
+              lastFetchTime = new Date(heatmapRollup.generated);
+              dataSource = "json";
+              isLiveData = true;
+              updateDataStatus();
+              await renderHeatMap();
+              observeTreeRings();
+              return;
+          }
+
+          // No rollup: the heatmap needs every repo's commits
           const jsonOk = await loadStaticStats();
 
           if (!jsonOk) {
@@ -585,6 +673,34 @@
           REPOS.forEach((repo) => renderTreeRingsFromCache(repo));
       }
 
+        // Load a repo's shard and draw its tree rings once the sample is near
+        // the viewport. Re-observing on each refresh redraws visible ones.
+        const treeRingObserver =
+            "IntersectionObserver" in window
+                ? new IntersectionObserver(
+                      (entries, obs) => {
+                          entries.forEach((entry) => {
+                              if (!entry.isIntersecting) return;
+                              obs.unobserve(entry.target);
+                              loadTreeRings(entry.target.dataset.repo);
+                          });
+                      },
+                      { rootMargin: "200px 0px" },
+                  )
+                : null;
+
+        async function loadTreeRings(repo) {
+            if (dataSource === "json") await loadStaticStats([repo]);
+            renderTreeRingsFromCache(repo);
+        }
+
+        function observeTreeRings() {
+            document.querySelectorAll(".tree-sample[data-repo]").forEach((el) => {
+                if (treeRingObserver) treeRingObserver.observe(el);
+                else loadTreeRings(el.dataset.repo);
+            });
+        }
+
         // Force live refresh (bypasses JSON, goes straight to API)
         async function forceRefresh() {
             const statusDot = document.getElementById("status-dot");
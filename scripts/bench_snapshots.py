@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Benchmark the site build's rendering path on synthetic corpora.
+Generates README/docs text from 1 KB to 10 MB (typical Markdown plus an
+adversarial mix aimed at the parser: unterminated Features sections, unclosed
+emphasis, star runs, unclosed fences, unbalanced link parens) and project
+sets from 5 to 1,000 repos, then times the functions build_site.py runs and
+records their peak traced memory:
+
+    extract_features, extract_tech_stack                  (snapshot_lib)
+    project_page: analyse + render_page                   (build_site)
+    doc_render: DocRenderer.render, no disk cache         (doc_pages)
+    acquire + project_page per project                    (build_site)
+    copy_docs (cold and warm)                             (snapshot_lib)
+    render_docs + write_doc_pages (empty and warm cache)  (doc_pages)
+
+Each case runs once untimed first, so imports and lazy setup (Pygments
+lexers and styles) are not charged to the first size measured.
+
+Results can be saved as a baseline and later runs compared against it; any
+case slower (or hungrier) than the baseline beyond the tolerance, or over the
+per-case timeout, is reported as a REGRESSION and the exit code is 1.
+
+Every run also renders each adversarial construct on its own at 100 KB
+(doc_render and Highlighter.replace_fences) and compares it with
+typical Markdown of the same size from the same run; a construct costing more
+than CHECK_RATIO times as much is a REGRESSION too, baseline or not.
+
+Usage (scripts/bench-baseline.json is the committed --quick baseline):
+    python3 scripts/bench_snapshots.py --quick --baseline scripts/bench-baseline.json
+    python3 scripts/bench_snapshots.py --quick --save-baseline scripts/bench-baseline.json
+
+Pure Python stdlib (plus whatever the benchmarked modules import).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import shutil
+import signal
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import doc_pages
+import snapshot_lib
+from build_site import DirectorySource, acquire, analyse, render_page
+from highlight import Highlighter
+from output_writer import OutputWriter
+from tech_stack import TECH_KEYWORDS
+
+KB = 1024
+MB = 1024 * KB
+SIZES = (1 * KB, 10 * KB, 100 * KB, 1 * MB, 10 * MB)
+QUICK_SIZES = (1 * KB, 10 * KB, 100 * KB)
+PROJECT_COUNTS = (5, 100, 1000)
+QUICK_PROJECT_COUNTS = (5, 100)
+DOCS_PER_PROJECT = 3
+MIN_TIME = 0.2  # seconds of repeats per case before taking the best
+MAX_REPEATS = 20
+CHECK_SIZE = 100 * KB
+# Allowed cost of one adversarial construct relative to typical Markdown of
+# the same size. Dense emphasis legitimately runs a few times slower; a scan
+# that goes back over the text lands well past this.
+CHECK_RATIO = 10.0
+
+WORDS = (
+    "build index query cache stream token model agent vector store render page sync "
+    "local remote schema layer view state async task queue retry batch embed search"
+).split()
+
+
+class CaseTimeout(Exception):
+    pass
+
+
+# -- corpus ------------------------------------------------------------------
+
+
+def _sentence(rng, words=12):
+    parts = [rng.choice(WORDS) for _ in range(words)]
+    if rng.random() < 0.5:
+        parts[rng.randrange(words)] = rng.choice(TECH_KEYWORDS)
+    return " ".join(parts).capitalize() + "."
+
+
+def _typical_block(rng, i):
+    """One section of ordinary README-style Markdown."""
+    lines = [f"## Section {i}", "", " ".join(_sentence(rng) for _ in range(4)), ""]
+    if i % 5 == 0:
+        lines += ["## Features", ""]
+        lines += [f"- **Feature {i}.{n}**: {_sentence(rng)}" for n in range(4)]
+        lines += [f"- {_sentence(rng)}", ""]
+    lines += [f"* **{rng.choice(WORDS)}** and *{rng.choice(WORDS)}* with `{rng.choice(WORDS)}()`", ""]
+    if i % 3 == 0:
+        lang = ("python", "swift", "bash", "")[i % 4]
+        lines += [f"```{lang}", f"def step_{i}(x):", f"    return x * {i}  # {rng.choice(WORDS)}", "```", ""]
+    lines += [f"See [the docs](https://example.com/{i}) for {rng.choice(TECH_KEYWORDS)}.", ""]
+    return "\n".join(lines) + "\n"
+
+
+def typical_markdown(size, seed=0):
+    rng = random.Random(seed)
+    blocks, total, i = [], 0, 0
+    while total < size:
+        block = _typical_block(rng, i)
+        blocks.append(block)
+        total += len(block)
+        i += 1
+    return "".join(blocks)[:size]
+
+
+# Each builder returns one construct of about n characters, scaled with the
+# corpus so superlinear behaviour inside a single construct shows up.
+ADVERSARIAL = {
+    # Lazy DOTALL body with a lookahead that never finds the next "##".
+    "features-unterminated": lambda n: "## Core Features\n" + "- item without bold text here\n" * (n // 30),
+    # Many "##" that look like the start of a Features heading but aren't.
+    "heading-runs": lambda n: "## Feature\n## Features " * (n // 22) + "\n",
+    # Emphasis openers with no closer on the same line.
+    "emphasis-unclosed": lambda n: "*" + "a " * (n // 2) + "\n",
+    "strong-unclosed": lambda n: "**" + "b " * (n // 2) + "\n",
+    # Alternating star runs.
+    "star-runs": lambda n: "**a*" * (n // 4) + "\n",
+    # Bold feature bullet that never closes its "**".
+    "bullet-unclosed": lambda n: "## Features\n- **" + "c" * n + "\n",
+    # Fence that is opened and never closed.
+    "fence-unclosed": lambda n: "```python\n" + "x = 1  # `tick`\n" * (n // 16),
+    # Inline code ticks without partners.
+    "backtick-runs": lambda n: "`a" * (n // 2) + "\n",
+    # Long fences each followed by a shorter line that cannot close them.
+    "fence-reopened": lambda n: "````a\n```\n" * (n // 10),
+    # Link destinations that open parentheses and never close them.
+    "link-parens": lambda n: "[a](b(" * (n // 6) + "\n",
+}
+
+
+def adversarial_markdown(size):
+    share = max(1, size // len(ADVERSARIAL))
+    text = "".join(build(share) for build in ADVERSARIAL.values())
+    return text[:size]
+
+
+def make_projects(root, count, readme_size=4 * KB, doc_size=8 * KB):
+    """Write count synthetic repos under root; return {project_id: config}."""
+    projects = {}
+    for n in range(count):
+        repo = os.path.join(root, f"Repo{n}")
+        os.makedirs(os.path.join(repo, "docs"))
+        with open(os.path.join(repo, "README.md"), "w", encoding="utf-8") as f:
+            f.write(f"# Repo{n}\n\n" + typical_markdown(readme_size, seed=n))
+        for d in range(DOCS_PER_PROJECT):
+            with open(os.path.join(repo, "docs", f"DOC{d}.md"), "w", encoding="utf-8") as f:
+                f.write(typical_markdown(doc_size, seed=n * 31 + d))
+        projects[f"repo{n}"] = {
+            "repo_path": repo,
+            "title": f"Repo{n}",
+            "tagline": "Synthetic benchmark project.",
+            "app_store_url": "",
+            "github_url": f"https://github.com/example/Repo{n}",
+            "accent_color": "#6366f1",
+            "icon": "icon.png",
+            "story_cards": [],
+        }
+    return projects
+
+
+# -- measurement -------------------------------------------------------------
+
+
+def _alarm(signum, frame):
+    raise CaseTimeout()
+
+
+def measure(fn, timeout, min_time=MIN_TIME, max_repeats=MAX_REPEATS):
+    """Return (best_seconds, repeats, peak_bytes) for fn(), or raise CaseTimeout.
+
+    One untimed warm-up run comes first; timing then repeats until min_time
+    has passed (best run wins); one extra run under tracemalloc gives the
+    peak memory."""
+    signal.signal(signal.SIGALRM, _alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        fn()
+        best, spent, repeats = float("inf"), 0.0, 0
+        while repeats < max_repeats and (repeats == 0 or spent < min_time):
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+            best, spent, repeats = min(best, elapsed), spent + elapsed, repeats + 1
+        tracemalloc.start()
+        try:
+            fn()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+    return best, repeats, peak
+
+
+_doc_renderer = None
+
+
+def doc_render(text):
+    """DocRenderer.render with no disk cache and a fresh in-memory
+    highlighter, so repeats don't just hit a memo."""
+    global _doc_renderer
+    if _doc_renderer is None:
+        _doc_renderer = doc_pages.DocRenderer(cache_dir=None)
+    _doc_renderer.highlighter = Highlighter(cache_dir=None)
+    return _doc_renderer.render(text, "Bench", "https://github.com/example/Bench", "README.md")
+
+
+def project_page(project_id, config, readme, docs=()):
+    """What a build does for one project's index.html."""
+    (features, tech), _ = analyse(project_id, readme, list(docs))
+    return render_page(project_id, config, features, tech)[0]
+
+
+def text_cases(sizes):
+    """(name, fn) for each text function at each size, typical and adversarial."""
+    config = {
+        "title": "Bench",
+        "tagline": "Synthetic benchmark project.",
+        "app_store_url": "",
+        "github_url": "https://github.com/example/Bench",
+        "accent_color": "#6366f1",
+        "icon": "icon.png",
+        "story_cards": [],
+    }
+    for size in sizes:
+        label = f"{size // MB}MB" if size >= MB else f"{size // KB}KB"
+        for kind, text in (("typical", typical_markdown(size)), ("adversarial", adversarial_markdown(size))):
+            yield f"extract_features/{kind}/{label}", lambda t=text: snapshot_lib.extract_features(t)
+            yield f"extract_tech_stack/{kind}/{label}", lambda t=text: snapshot_lib.extract_tech_stack(t)
+            yield f"doc_render/{kind}/{label}", lambda t=text: doc_render(t)
+            yield f"project_page/{kind}/{label}", lambda t=text: project_page("bench", config, t)
+
+
+def check_cases():
+    """(name, fn) for typical Markdown and each adversarial construct alone
+    at CHECK_SIZE, held to CHECK_RATIO by over_budget()."""
+    label = f"{CHECK_SIZE // KB}KB"
+    texts = {"typical": typical_markdown(CHECK_SIZE)}
+    texts.update((name, build(CHECK_SIZE)) for name, build in ADVERSARIAL.items())
+    for kind, text in texts.items():
+        yield f"check/doc_render/{kind}/{label}", lambda t=text: doc_render(t)
+        yield f"check/replace_fences/{kind}/{label}", lambda t=text: Highlighter(cache_dir=None).replace_fences(t, str)
+
+
+def over_budget(results, ratio=CHECK_RATIO):
+    """Return a message for each check case slower than ratio x typical."""
+    problems = []
+    for name, r in results.items():
+        if not name.startswith("check/") or "seconds" not in r:
+            continue
+        _, fn, kind, label = name.split("/")
+        typical = results.get(f"check/{fn}/typical/{label}", {}).get("seconds")
+        if kind != "typical" and typical and r["seconds"] > typical * ratio:
+            problems.append(
+                f"{name}: {r['seconds'] * 1000:.2f} ms, {r['seconds'] / typical:.1f}x typical "
+                f"({typical * 1000:.2f} ms, limit {ratio:g}x)"
+            )
+    return problems
+
+
+def project_cases(counts, workdir):
+    """(name, fn) for whole-site passes over synthetic project sets."""
+    for count in counts:
+        root = os.path.join(workdir, f"repos-{count}")
+        projects = make_projects(root, count)
+        out = os.path.join(workdir, f"out-{count}")
+
+        def pages(projects=projects):
+            for project_id, config in projects.items():
+                snapshot = acquire(DirectorySource(config["repo_path"]))
+                project_page(project_id, config, snapshot.readme, snapshot.docs.values())
+
+        def copy_cold(projects=projects, out=out):
+            shutil.rmtree(out, ignore_errors=True)
+            copy_warm(projects, out)
+
+        def copy_warm(projects=projects, out=out):
+            for project_id, config in projects.items():
+                snapshot_lib.copy_docs(config["repo_path"], os.path.join(out, project_id))
+
+        def render_pages(projects=projects, out=out, cache=None):
+            renderer = doc_pages.DocRenderer(cache_dir=cache, highlighter=Highlighter(cache_dir=None))
+            writer = OutputWriter()
+            for project_id, config in projects.items():
+                snapshot = acquire(DirectorySource(config["repo_path"]))
+                sources = {os.path.basename(path): text for path, text in snapshot.docs.items()}
+                sources["README.md"] = snapshot.readme
+                docs_dir = os.path.join(out, project_id, "docs")
+                rendered = doc_pages.render_docs(renderer, config, sources, snapshot.readme_path)
+                doc_pages.write_doc_pages(writer, config, docs_dir, rendered, readme_path=snapshot.readme_path)
+
+        render_cache = os.path.join(workdir, f"render-cache-{count}")
+        render_pages(cache=render_cache)  # prime, so the warm case measures hits only
+        yield f"project_page/projects/{count}", pages
+        yield f"copy_docs/cold/{count}", copy_cold
+        yield f"copy_docs/warm/{count}", copy_warm
+        yield f"doc_pages/cold/{count}", render_pages
+        yield f"doc_pages/warm/{count}", lambda fn=render_pages, cache=render_cache: fn(cache=cache)
+
+
+# -- baseline ----------------------------------------------------------------
+
+
+def compare(results, baseline, tolerance, mem_tolerance, noise_s=0.005, noise_bytes=1 * MB):
+    """Return a list of regression messages against a baseline's cases."""
+    problems = []
+    old_cases = baseline.get("cases", {})
+    for name, r in results.items():
+        if r.get("timeout"):
+            problems.append(f"{name}: timed out")
+            continue
+        old = old_cases.get(name)
+        if not old or old.get("timeout"):
+            continue
+        if r["seconds"] > old["seconds"] * tolerance and r["seconds"] - old["seconds"] > noise_s:
+            problems.append(
+                f"{name}: {r['seconds'] * 1000:.2f} ms vs baseline {old['seconds'] * 1000:.2f} ms "
+                f"({r['seconds'] / old['seconds']:.2f}x)"
+            )
+        if r["peak_bytes"] > old["peak_bytes"] * mem_tolerance and r["peak_bytes"] - old["peak_bytes"] > noise_bytes:
+            problems.append(
+                f"{name}: peak {r['peak_bytes'] / MB:.1f} MB vs baseline {old['peak_bytes'] / MB:.1f} MB"
+            )
+    return problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the site build's rendering path on synthetic corpora")
+    parser.add_argument("--quick", action="store_true", help="sizes up to 100 KB and up to 100 projects")
+    parser.add_argument("--sizes", type=int, nargs="+", metavar="BYTES", help="corpus sizes to generate")
+    parser.add_argument("--projects", type=int, nargs="+", metavar="N", help="project counts to generate")
+    parser.add_argument("--only", action="append", default=[], metavar="TEXT", help="run cases whose name contains TEXT")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds per case before it counts as a regression")
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write results as the baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against this baseline and fail on regressions")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown ratio (default 1.5)")
+    parser.add_argument("--mem-tolerance", type=float, default=1.5, help="allowed peak-memory ratio (default 1.5)")
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+    counts = args.projects or (QUICK_PROJECT_COUNTS if args.quick else PROJECT_COUNTS)
+
+    results = {}
+    print(f"{'case':<52} {'best ms':>10} {'runs':>5} {'MB/s':>8} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory(prefix="bench-snapshots-") as workdir:
+        cases = [*check_cases(), *text_cases(sizes)]
+        for name, fn in [*cases, *project_cases(counts, workdir)]:
+            if args.only and not any(s in name for s in args.only):
+                continue
+            try:
+                seconds, repeats, peak = measure(fn, args.timeout)
+            except CaseTimeout:
+                results[name] = {"timeout": args.timeout}
+                print(f"{name:<52} {'TIMEOUT':>10} (> {args.timeout:.0f}s)")
+                continue
+            results[name] = {"seconds": round(seconds, 6), "repeats": repeats, "peak_bytes": peak}
+            size = _case_bytes(name)
+            rate = f"{size / MB / seconds:>8.1f}" if size and seconds else f"{'':>8}"
+            print(f"{name:<52} {seconds * 1000:>10.2f} {repeats:>5} {rate} {peak / MB:>8.1f}")
+
+    output = {
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "config": {"sizes": list(sizes), "projects": list(counts), "timeout": args.timeout},
+        "cases": results,
+    }
+    for path in (args.json_path, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(output, f, indent=2)
+            print(f"Wrote {path}")
+
+    problems = [f"{name}: timed out" for name, r in results.items() if r.get("timeout")]
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            problems = compare(results, json.load(f), args.tolerance, args.mem_tolerance)
+    problems += over_budget(results)
+    if problems:
+        print(f"\n❌ REGRESSION: {len(problems)} case(s)")
+        for line in problems:
+            print(f"   {line}")
+        return 1
+    return 0
+
+
+def _case_bytes(name):
+    """Corpus size encoded in a text case's name, for throughput."""
+    label = name.rsplit("/", 1)[-1]
+    for suffix, unit in (("MB", MB), ("KB", KB)):
+        if label.endswith(suffix) and label[: -len(suffix)].isdigit():
+            return int(label[: -len(suffix)]) * unit
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark fetch_stats.py against the local fake GitHub API.
+Each scenario runs fetch_stats.py as a child process in a scratch directory
+and reports requests served, 304s, bytes sent, wall time and the child's peak
+RSS. Scenarios run in sequence and share state, like consecutive cron runs:
+
+    cold         no previous output, empty ETag cache (full sync)
+    incremental  a few commits pushed to one repo since the last run
+    unchanged    nothing new upstream (should be all 304s, exit 3)
+    rewrite      one repo force-pushed (that repo falls back to a full resync)
+
+Usage:
+    python3 scripts/bench_stats.py --commits 10000 --json bench.json
+
+Pure Python stdlib (Linux/macOS: uses os.wait4 for per-run peak memory).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from fake_github import DEFAULT_REPOS, FakeGitHub
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FETCH_STATS = os.path.join(SCRIPTS_DIR, "fetch_stats.py")
+PER_PAGE = 100
+
+
+def run_fetch(workdir, base_url, args, verbose=False):
+    """Run fetch_stats.py once; return (exit_code, wall_seconds, peak_rss_kb)."""
+    env = dict(os.environ, GITHUB_API_URL=base_url, GITHUB_GRAPHQL_URL=f"{base_url}/graphql", GITHUB_TOKEN="bench-token")
+    out = None if verbose else subprocess.DEVNULL
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, FETCH_STATS, *args], cwd=workdir, env=env, stdout=out, stderr=out)
+    _, status, usage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is KB on Linux, bytes on macOS.
+    peak_kb = usage.ru_maxrss / 1024 if sys.platform == "darwin" else usage.ru_maxrss
+    return proc.returncode, wall, peak_kb
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark fetch_stats.py against a fake GitHub API")
+    parser.add_argument("--commits", type=int, default=10000, help="synthetic commits per repo")
+    parser.add_argument("--repos", type=int, default=len(DEFAULT_REPOS), help="number of repos (first N of REPOS)")
+    parser.add_argument("--new-commits", type=int, default=5, help="commits pushed before the incremental run")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds of server latency per request")
+    parser.add_argument("--jobs", type=int, default=4)
+    parser.add_argument("--backend", choices=("rest", "graphql"), default="rest")
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    parser.add_argument("--verbose", action="store_true", help="show fetch_stats.py output")
+    args = parser.parse_args(argv)
+
+    repos = DEFAULT_REPOS[: args.repos]
+    fake = FakeGitHub.synthetic(args.commits, repos=repos, latency=args.latency)
+    base_url = fake.start()
+    max_pages = max(1, -(-(args.commits + args.new_commits) // PER_PAGE))
+    fetch_args = ["--jobs", str(args.jobs), "--max-pages", str(max_pages), "--backend", args.backend]
+
+    steps = [
+        ("cold", lambda: None),
+        ("incremental", lambda: fake.add_commits(repos[0], args.new_commits)),
+        ("unchanged", lambda: None),
+        ("rewrite", lambda: fake.rewrite_history(repos[-1])),
+    ]
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench-stats-") as workdir:
+        os.makedirs(os.path.join(workdir, "data"))
+        for name, prepare in steps:
+            prepare()
+            before = (fake.requests, fake.not_modified, fake.bytes_sent)
+            code, wall, peak_kb = run_fetch(workdir, base_url, fetch_args, args.verbose)
+            results.append(
+                {
+                    "scenario": name,
+                    "exit": code,
+                    "requests": fake.requests - before[0],
+                    "not_modified": fake.not_modified - before[1],
+                    "bytes": fake.bytes_sent - before[2],
+                    "wall_s": round(wall, 3),
+                    "peak_rss_mb": round(peak_kb / 1024, 1),
+                }
+            )
+    fake.stop()
+
+    print(
+        f"fetch_stats.py: {len(repos)} repos x {args.commits} commits, backend={args.backend}, "
+        f"jobs={args.jobs}, latency={args.latency * 1000:.0f}ms"
+    )
+    print(f"{'scenario':<12} {'exit':>4} {'requests':>9} {'304s':>6} {'KB sent':>10} {'wall s':>8} {'peak MB':>8}")
+    for r in results:
+        print(
+            f"{r['scenario']:<12} {r['exit']:>4} {r['requests']:>9} {r['not_modified']:>6} "
+            f"{r['bytes'] / 1024:>10.1f} {r['wall_s']:>8.2f} {r['peak_rss_mb']:>8.1f}"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+        print(f"Wrote {args.json_path}")
+
+    failed = [r for r in results if r["exit"] not in (0, 3)]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
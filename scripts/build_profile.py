@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Per-project, per-stage profiling for the site build.
+Stages are timed with `with profiler.stage(project, name) as s:`, which
+records wall time, CPU time of the running thread (so thread-pool stages
+don't count each other's work), call count, and whatever bytes/cache
+counters the stage adds. Stages run in worker processes are timed by a
+profiler there and merged back. The result is written as build-report.json.
+Optionally the slowest project can be re-run under cProfile + tracemalloc.
+NO EXTERNAL DEPENDENCIES - pure Python stdlib.
+"""
+
+import cProfile
+import datetime
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+COUNTERS = ("bytes_read", "bytes_written", "cache_hits", "cache_misses")
+
+
+class StageStats:
+    __slots__ = ("calls", "wall", "cpu") + COUNTERS
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        for name in COUNTERS:
+            setattr(self, name, 0)
+
+    def add(self, **counts):
+        for name, value in counts.items():
+            setattr(self, name, getattr(self, name) + value)
+
+    def merge(self, other):
+        self.calls += other.calls
+        self.wall += other.wall
+        self.cpu += other.cpu
+        self.add(**{c: getattr(other, c) for c in COUNTERS})
+
+    def as_dict(self):
+        d = {"calls": self.calls, "wall_s": round(self.wall, 6), "cpu_s": round(self.cpu, 6)}
+        d.update((name, getattr(self, name)) for name in COUNTERS if getattr(self, name))
+        return d
+
+
+def _process_cpu():
+    """CPU time of this process plus its finished children (worker pools)."""
+    t = os.times()
+    return time.process_time() + t.children_user + t.children_system
+
+
+class BuildProfiler:
+    """Collects StageStats keyed by (project, stage); safe across threads."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.cpu_started = _process_cpu()
+        self.stats = {}
+        self.caches = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, project, name):
+        """Time a stage; the yielded object takes add(bytes_read=…, …)."""
+        local = StageStats()
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield local
+        finally:
+            local.wall = time.perf_counter() - wall
+            local.cpu = time.thread_time() - cpu
+            local.calls = 1
+            with self._lock:
+                self.stats.setdefault((project, name), StageStats()).merge(local)
+
+    def merge(self, stats):
+        """Fold in another profiler's stats (e.g. from a worker process)."""
+        with self._lock:
+            for key, s in stats.items():
+                self.stats.setdefault(key, StageStats()).merge(s)
+
+    def stage_total(self, name):
+        """One stage's stats summed over every project."""
+        total = StageStats()
+        for (_, stage), s in self.stats.items():
+            if stage == name:
+                total.merge(s)
+        return total
+
+    def cache(self, name, hits, misses):
+        """Record a run-wide cache's hit/miss totals."""
+        self.caches[name] = {"hits": hits, "misses": misses}
+
+    def project_wall(self, project):
+        return sum(s.wall for (p, _), s in self.stats.items() if p == project)
+
+    def slowest_project(self):
+        projects = {p for p, _ in self.stats}
+        return max(projects, key=self.project_wall) if projects else None
+
+    def report(self, **extra):
+        projects = {}
+        stages = {}
+        for (project, name), s in sorted(self.stats.items()):
+            entry = projects.setdefault(project, {"wall_s": 0.0, "cpu_s": 0.0, "stages": {}})
+            entry["stages"][name] = s.as_dict()
+            entry["wall_s"] = round(entry["wall_s"] + s.wall, 6)
+            entry["cpu_s"] = round(entry["cpu_s"] + s.cpu, 6)
+            stages.setdefault(name, StageStats()).merge(s)
+        report = {
+            "generated": datetime.datetime.now(datetime.timezone.utc).isoformat().replace("+00:00", "Z"),
+            "wall_s": round(time.perf_counter() - self.started, 6),
+            "cpu_s": round(_process_cpu() - self.cpu_started, 6),
+            "stages": {name: s.as_dict() for name, s in stages.items()},
+            "projects": projects,
+            "caches": self.caches,
+            "slowest_project": self.slowest_project(),
+        }
+        report.update(extra)
+        return report
+
+    def write_report(self, path, **extra):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(**extra), f, indent=2)
+            f.write("\n")
+
+    def summary(self, limit=5):
+        """Human-readable top stages by wall time."""
+        lines = []
+        ranked = sorted(self.stats.items(), key=lambda kv: kv[1].wall, reverse=True)[:limit]
+        for (project, name), s in ranked:
+            lines.append(f"     {s.wall * 1000:8.1f} ms  {project}/{name}")
+        return "\n".join(lines)
+
+
+def profile_call(fn, out_dir, label, top=30):
+    """Run fn() under cProfile and tracemalloc and dump both into out_dir.
+
+    Writes <label>.prof (load with pstats/snakeviz), <label>.prof.txt (top
+    functions by cumulative time), <label>.tracemalloc (a Snapshot dump) and
+    <label>.tracemalloc.txt (top allocation sites). Returns fn's result.
+    cProfile only sees the calling thread, so fn must do its work inline
+    (e.g. BuildGraph.run(1)), not hand it to a pool."""
+    os.makedirs(out_dir, exist_ok=True)
+    base = os.path.join(out_dir, label)
+    profiler = cProfile.Profile()
+    tracemalloc.start(25)
+    try:
+        result = profiler.runcall(fn)
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    profiler.dump_stats(base + ".prof")
+    with open(base + ".prof.txt", "w", encoding="utf-8") as f:
+        pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(top)
+    snapshot.dump(base + ".tracemalloc")
+    with open(base + ".tracemalloc.txt", "w", encoding="utf-8") as f:
+        f.write(f"peak traced memory: {peak / 1024:.1f} KB\n\n")
+        for stat in snapshot.statistics("lineno")[:top]:
+            f.write(f"{stat}\n")
+    return result
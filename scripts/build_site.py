@@ -0,0 +1,768 @@
+#!/usr/bin/env python3
+"""
+Single-pass site build for the projects/ pages.
+Runs the whole build as a dependency graph of small per-project tasks:
+
+    acquire ──> parse ──┬──> render ────────────┐
+       │                └──> assets ──> pages ──┴──> write
+       └──────> docs-page            (--docs-pages)
+
+pages renders README + docs/*.md to docs/<name>.html (see doc_pages.py).
+
+Every stage is timed per project (wall, CPU, bytes, cache hits) into
+build-report.json; --profile re-runs the slowest project under cProfile and
+tracemalloc and dumps both.
+
+Sources are pluggable adapters: the CI _repos/ checkout, local clones next to
+this repo, or raw files over HTTP (ETag-cached). Independent tasks run in a
+thread pool as soon as their inputs are ready, and one acquisition feeds every
+stage that needs it. The threads only do I/O (reading sources, mirroring,
+writing); the CPU-bound work (Markdown parsing, tech scan, page and doc
+rendering, highlighting) is handed to a pool of --jobs worker processes, so
+it spreads over every core instead of queueing on the GIL. A project whose
+inputs hash the same as on the last run skips render and write entirely
+(--force rebuilds).
+
+    python3 scripts/build_site.py                       # CI: _repos/ checkout
+    python3 scripts/build_site.py --source local --docs-pages
+    python3 scripts/build_site.py --source http --only opencone
+
+This is the one build pipeline: generate_snapshots_ci.py (CI checkout) and
+generate_all_snapshots.py (local clones) are thin wrappers that call main().
+Project config, page inputs and the build cache live in snapshot_lib.
+NO EXTERNAL DEPENDENCIES - pure Python stdlib (--docs-pages needs markdown).
+"""
+
+import argparse
+import hashlib
+import multiprocessing
+import os
+import tempfile
+from collections import namedtuple
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import build_profile
+import doc_pages
+import highlight
+import md_document
+import mirror
+import output_writer
+import project_page
+import snapshot_lib
+import tech_stack
+from build_profile import BuildProfiler, profile_call
+from doc_pages import DocRenderer, previous_pages, render_docs, write_doc_pages
+from highlight import Highlighter
+from http_cache import ResponseCache
+from http_client import HTTPError, HttpClient
+from output_writer import OutputWriter, read_stamp
+from project_page import stream_project_page
+from snapshot_lib import (
+    BUILD_CACHE_NAME,
+    DOCS_HREF,
+    OUTPUT_FILENAME,
+    PROJECTS,
+    README_CANDIDATES,
+    copy_docs,
+    extract_features,
+    extract_tech_stack,
+    input_hash,
+    load_build_cache,
+    mirrored_docs,
+    outputs_present,
+    save_build_cache,
+)
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+OUTPUT_DIR = os.path.join(ROOT, "projects")
+REPOS_DIR = os.path.join(ROOT, "_repos")
+# Local clones live next to this repo (…/GitHub/<RepoName>).
+LOCAL_REPOS_ROOT = os.path.dirname(ROOT)
+DOCS_PAGE_FILENAME = "docs.html"
+RAW_BASE_URL = os.environ.get("RAW_GITHUB_URL", "https://raw.githubusercontent.com").rstrip("/")
+DEFAULT_CACHE_DIR = os.path.join(ROOT, ".cache", "raw-docs")
+REPORT_PATH = os.path.join(ROOT, "build-report.json")
+PROFILE_DIR = os.path.join(ROOT, ".cache", "profile")
+DEFAULT_JOBS = 8
+# (doc_pages render cache, highlight cache) directories; None disables one.
+DEFAULT_CACHES = (doc_pages.DEFAULT_CACHE_DIR, highlight.DEFAULT_CACHE_DIR)
+OWNER = "Gunnarguy"
+# HTTP sources can't list a directory, so they fetch these docs.
+HTTP_DOC_PATHS = ("docs/ROADMAP.md", "docs/ARCHITECTURE.md")
+
+
+# -- sources -----------------------------------------------------------------
+
+
+class DirectorySource:
+    """A repo on disk (a local clone or a CI checkout)."""
+
+    kind = "local"
+
+    def __init__(self, root):
+        self.root = root
+        self.label = root
+
+    def exists(self):
+        return os.path.isdir(self.root)
+
+    def read(self, path):
+        try:
+            with open(os.path.join(self.root, path), "r", encoding="utf-8") as f:
+                return f.read()
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            return None
+
+    def docs_dir(self):
+        return os.path.join(self.root, "docs")
+
+    def doc_paths(self):
+        docs = self.docs_dir()
+        if not os.path.isdir(docs):
+            return []
+        return [
+            f"docs/{name}"
+            for name in sorted(os.listdir(docs))
+            if name.endswith(".md") and os.path.isfile(os.path.join(docs, name))
+        ]
+
+
+class CheckoutSource(DirectorySource):
+    """A repo checked out by actions/checkout into _repos/<RepoName>."""
+
+    kind = "checkout"
+
+
+class HttpSource:
+    """A repo read file-by-file from raw.githubusercontent.com."""
+
+    kind = "http"
+
+    def __init__(self, owner, repo, ref, client, cache=None, doc_paths=HTTP_DOC_PATHS):
+        self.owner, self.repo, self.ref = owner, repo, ref
+        self.client = client
+        self.cache = cache
+        self._doc_paths = list(doc_paths)
+        self.label = f"{RAW_BASE_URL}/{owner}/{repo}/{ref}"
+
+    def exists(self):
+        return True
+
+    def read(self, path):
+        url = f"{self.label}/{path}"
+        try:
+            if self.cache is not None:
+                resp = self.cache.fetch(self.client, url, negative_ttl=6 * 3600)
+            else:
+                resp = self.client.get(url)
+        except HTTPError as e:
+            if e.status == 404:
+                return None
+            raise
+        return resp.body.decode("utf-8")
+
+    def docs_dir(self):
+        return None
+
+    def doc_paths(self):
+        return list(self._doc_paths)
+
+
+# -- task graph --------------------------------------------------------------
+
+
+class UpstreamFailed(Exception):
+    """A task was not run because one of its dependencies failed."""
+
+
+class BuildGraph:
+    """Named tasks with dependencies; each task gets its deps' results as args."""
+
+    def __init__(self):
+        self.tasks = {}
+
+    def add(self, name, fn, deps=()):
+        if name in self.tasks:
+            raise ValueError(f"duplicate task {name}")
+        self.tasks[name] = (fn, tuple(deps))
+        return name
+
+    def run(self, jobs=DEFAULT_JOBS):
+        """Run every task once its deps are done. Returns (results, errors).
+
+        jobs <= 1 runs every task inline in the calling thread, so profilers
+        and debuggers attached to it see the real work."""
+        for name, (_, deps) in self.tasks.items():
+            unknown = [d for d in deps if d not in self.tasks]
+            if unknown:
+                raise ValueError(f"{name} depends on unknown task(s) {unknown}")
+        if jobs <= 1:
+            return self._run_serial()
+        results, errors = {}, {}
+        pending = dict(self.tasks)
+        running = {}
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            while pending or running:
+                for name, fn, deps in self._ready(pending, results, errors):
+                    running[pool.submit(fn, *(results[d] for d in deps))] = name
+                if not running:
+                    if pending:
+                        raise ValueError(f"dependency cycle among {sorted(pending)}")
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        errors[name] = e
+        return results, errors
+
+    def _run_serial(self):
+        results, errors = {}, {}
+        pending = dict(self.tasks)
+        while pending:
+            ready = list(self._ready(pending, results, errors))
+            if not ready:
+                if pending:
+                    raise ValueError(f"dependency cycle among {sorted(pending)}")
+                break
+            for name, fn, deps in ready:
+                try:
+                    results[name] = fn(*(results[d] for d in deps))
+                except Exception as e:
+                    errors[name] = e
+        return results, errors
+
+    @staticmethod
+    def _ready(pending, results, errors):
+        """Pop and yield (name, fn, deps) for tasks whose deps all succeeded;
+        tasks behind a failure are marked UpstreamFailed."""
+        marked = True
+        while marked:  # a failure can cascade to tasks listed before it
+            marked = False
+            for name, (fn, deps) in list(pending.items()):
+                failed = [d for d in deps if d in errors]
+                if failed:
+                    errors[name] = UpstreamFailed(", ".join(failed))
+                    del pending[name]
+                    marked = True
+                elif all(d in results for d in deps):
+                    del pending[name]
+                    yield name, fn, deps
+
+
+# -- stages ------------------------------------------------------------------
+
+Snapshot = namedtuple("Snapshot", "source readme readme_path docs")
+Parsed = namedtuple("Parsed", "snapshot features tech key skip")
+
+
+# -- CPU-bound work ------------------------------------------------------------
+# These run in the worker processes (inline with --jobs 1), so they take and
+# return plain picklable values and time themselves with a local profiler
+# whose stats the parent merges: (result, profiler.stats).
+
+_renderers = {}  # caches -> this process's DocRenderer
+
+
+def doc_renderer(caches):
+    renderer = _renderers.get(caches)
+    if renderer is None:
+        doc_cache, highlight_cache = caches
+        renderer = _renderers[caches] = DocRenderer(doc_cache, Highlighter(highlight_cache))
+    return renderer
+
+
+def analyse(project_id, readme, docs):
+    """Features and tech stack from README and doc texts."""
+    profiler = BuildProfiler()
+    with profiler.stage(project_id, "parse"):
+        document = md_document.parse(readme)
+    with profiler.stage(project_id, "features"):
+        features = extract_features(document)
+    with profiler.stage(project_id, "tech"):
+        tech = extract_tech_stack(document, *docs)
+    return (features, tech), profiler.stats
+
+
+def render_page(project_id, config, features, tech):
+    """The project's index.html."""
+    profiler = BuildProfiler()
+    with profiler.stage(project_id, "render"):
+        page = "".join(stream_project_page(config, features, tech, docs_href=DOCS_HREF))
+    return page, profiler.stats
+
+
+def render_doc_pages(project_id, config, sources, readme_path, caches):
+    """{name.md: {title, toc, body}} for the README and mirrored docs."""
+    profiler = BuildProfiler()
+    renderer = doc_renderer(caches)
+    with profiler.stage(project_id, "pages") as stats:
+        hits, misses = renderer.hits, renderer.misses
+        rendered = render_docs(renderer, config, sources, readme_path)
+        stats.add(cache_hits=renderer.hits - hits, cache_misses=renderer.misses - misses)
+    return rendered, profiler.stats
+
+
+def render_docs_page(project_id, fetched, split_docs, stamps, highlight_cache):
+    """{page name: {stamp: html}} for generate_snapshot's pages of one
+    project, rendered once for each stamp write_stamped may ask for."""
+    import generate_snapshot
+
+    cfg = next(c for c in generate_snapshot.CONFIG if c.slug == project_id)
+    highlighter = generate_snapshot.get_highlighter(highlight_cache)
+    profiler = BuildProfiler()
+    pages = {}
+    for name, render in generate_snapshot.page_renderers(cfg, fetched, split_docs, DOCS_PAGE_FILENAME).items():
+        with profiler.stage(project_id, "markdown") as stats:
+            hits, misses = highlighter.hits, highlighter.misses
+            pages[name] = {stamp: render(stamp) for stamp in stamps[name]}
+            stats.add(cache_hits=highlighter.hits - hits, cache_misses=highlighter.misses - misses)
+    return pages, profiler.stats
+
+
+def build_version(docs_pages=False):
+    """Hash of the code that shapes the output, so edits invalidate the cache."""
+    modules = [__file__, project_page.__file__, tech_stack.__file__, mirror.__file__, output_writer.__file__]
+    modules += [build_profile.__file__, md_document.__file__, doc_pages.__file__, snapshot_lib.__file__]
+    modules.append(highlight.__file__)
+    if docs_pages:
+        import generate_snapshot
+
+        modules.append(generate_snapshot.__file__)
+    # Doc pages are highlighted, so the Pygments version (or its absence)
+    # shapes the output too.
+    h = hashlib.sha256(highlight.BACKEND.encode())
+    for path in modules:
+        with open(os.path.abspath(path), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def acquire(source):
+    """Read README (with fallbacks) and docs from a source."""
+    if not source.exists():
+        raise FileNotFoundError(f"Repo not found: {source.label}")
+    for candidate in README_CANDIDATES:
+        readme = source.read(candidate)
+        if readme and readme.strip():
+            break
+    else:
+        raise FileNotFoundError("No README found or README is empty (checked root + docs)")
+    docs = {}
+    for path in source.doc_paths():
+        text = source.read(path)
+        if text is not None:
+            docs[path] = text
+    return Snapshot(source, readme, candidate, docs)
+
+
+class SiteBuild:
+    """Builds the task graph for a set of projects and runs it."""
+
+    def __init__(
+        self,
+        projects,
+        sources,
+        output_dir=OUTPUT_DIR,
+        force=False,
+        docs_pages=False,
+        split_docs=False,
+        profiler=None,
+        caches=DEFAULT_CACHES,
+    ):
+        self.projects = projects
+        self.sources = sources
+        self.output_dir = output_dir
+        self.cache_path = os.path.join(output_dir, BUILD_CACHE_NAME)
+        self.build_cache = {} if force else load_build_cache(self.cache_path)
+        self.docs_pages = docs_pages
+        self.split_docs = split_docs
+        self.version = build_version(docs_pages)
+        self.writer = OutputWriter(os.path.dirname(output_dir))
+        self.logs = {project_id: [] for project_id in projects}
+        self.keys = {}
+        self.profiler = profiler or BuildProfiler()
+        self.caches = caches
+        self._pool = None  # worker processes while run() is going
+
+    def _cpu(self, fn, *args):
+        """fn(*args) in a worker process (inline without a pool); its stage
+        timings are merged into the profiler and its result returned."""
+        if self._pool is None:
+            result, stats = fn(*args)
+        else:
+            result, stats = self._pool.submit(fn, *args).result()
+        self.profiler.merge(stats)
+        return result
+
+    @contextmanager
+    def _stage(self, project_id, name):
+        """profiler.stage that also charges this thread's output bytes."""
+        before = self.writer.thread_bytes_written()
+        with self.profiler.stage(project_id, name) as stats:
+            yield stats
+            stats.add(bytes_written=self.writer.thread_bytes_written() - before)
+
+    # Each stage takes its upstream results and returns its own.
+
+    def acquire(self, project_id, source):
+        with self._stage(project_id, "readme") as stats:
+            snapshot = acquire(source)
+            texts = [snapshot.readme, *snapshot.docs.values()]
+            stats.add(bytes_read=sum(len(t.encode("utf-8")) for t in texts))
+        return snapshot
+
+    def parse(self, project_id, snapshot):
+        config = self.projects[project_id]
+        log = self.logs[project_id]
+        log.append(f"   ✓ README: {snapshot.readme_path}")
+        with self._stage(project_id, "cache") as stats:
+            key = input_hash(config, snapshot.readme_path, snapshot.readme, snapshot.docs, self.version)
+            self.keys[project_id] = key
+            output_dir = os.path.join(self.output_dir, project_id)
+            hit = self.build_cache.get(project_id) == key and outputs_present(output_dir)
+            stats.add(cache_hits=int(hit), cache_misses=int(not hit))
+        if hit:
+            log.append("   = unchanged, skipped")
+            return Parsed(snapshot, None, None, key, True)
+        features, tech = self._cpu(analyse, project_id, snapshot.readme, list(snapshot.docs.values()))
+        return Parsed(snapshot, features, tech, key, False)
+
+    def render(self, project_id, parsed):
+        if parsed.skip:
+            return None
+        return self._cpu(render_page, project_id, self.projects[project_id], parsed.features, parsed.tech)
+
+    def assets(self, project_id, parsed):
+        """Mirror docs/*.md into projects/<id>/docs."""
+        if parsed.skip:
+            return None
+        with self._stage(project_id, "docs") as stats:
+            return self._mirror_docs(project_id, parsed.snapshot, stats)
+
+    def _mirror_docs(self, project_id, snapshot, stats):
+        output_dir = os.path.join(self.output_dir, project_id)
+        docs_dir = os.path.join(output_dir, "docs")
+        if snapshot.source.docs_dir() is not None:
+            result = copy_docs(snapshot.source.root, output_dir)
+            for name in result.copied + result.removed:
+                self.writer.record(os.path.join(docs_dir, name), True)
+            for name in result.unchanged:
+                self.writer.record(os.path.join(docs_dir, name), False)
+            names, removed = result.names, result.removed
+            copied = sum(os.path.getsize(os.path.join(docs_dir, name)) for name in result.copied)
+            stats.add(bytes_read=copied, bytes_written=copied)
+        else:
+            names = sorted(os.path.basename(p) for p in snapshot.docs if os.path.basename(p) != "README.md")
+            for path, text in snapshot.docs.items():
+                if os.path.basename(path) != "README.md":
+                    self.writer.write(os.path.join(docs_dir, os.path.basename(path)), text)
+            # Without a directory listing, orphans are the docs the manifest
+            # recorded plus listed docs that no longer exist upstream.
+            listed = {os.path.basename(p) for p in snapshot.source.doc_paths()}
+            removed = []
+            for name in sorted((set(mirrored_docs(output_dir)) | listed) - set(names) - {"README.md"}):
+                path = os.path.join(docs_dir, name)
+                if os.path.isfile(path):
+                    os.unlink(path)
+                    self.writer.record(path, True)
+                    removed.append(name)
+        if names or removed:
+            self.logs[project_id].append(f"   ✓ docs: {len(names)} mirrored, {len(removed)} removed")
+        return names
+
+    def pages(self, project_id, parsed, doc_names):
+        """Render README + the mirrored docs to static HTML pages."""
+        if parsed.skip:
+            return None
+        snapshot = parsed.snapshot
+        output_dir = os.path.join(self.output_dir, project_id)
+        texts = {os.path.basename(path): text for path, text in snapshot.docs.items()}
+        sources = {name: texts[name] for name in doc_names if name in texts}
+        sources["README.md"] = snapshot.readme
+        config = self.projects[project_id]
+        rendered = self._cpu(render_doc_pages, project_id, config, sources, snapshot.readme_path, self.caches)
+        with self._stage(project_id, "write"):
+            pages = write_doc_pages(
+                self.writer,
+                config,
+                os.path.join(output_dir, "docs"),
+                rendered,
+                previous=previous_pages(output_dir),
+                readme_path=snapshot.readme_path,
+            )
+        self.logs[project_id].append(f"   ✓ doc pages: {len(pages)}")
+        return pages
+
+    def write(self, project_id, parsed, page, doc_names, pages):
+        if parsed.skip:
+            return False
+        config = self.projects[project_id]
+        output_dir = os.path.join(self.output_dir, project_id)
+        with self._stage(project_id, "write"):
+            changed = self.writer.write(os.path.join(output_dir, OUTPUT_FILENAME), page)
+        self.logs[project_id].append(f"   ✓ {OUTPUT_FILENAME}" + ("" if changed else " (unchanged)"))
+        with self._stage(project_id, "manifest"):
+            self.writer.write(os.path.join(output_dir, "docs", "README.md"), parsed.snapshot.readme)
+            manifest = {
+                "project": project_id,
+                "title": config["title"],
+                "source_repo": config["github_url"],
+                "docs": doc_names,
+                "pages": pages,
+            }
+            self.writer.write_json(os.path.join(output_dir, "manifest.json"), manifest)
+        return True
+
+    def docs_page(self, project_id, snapshot):
+        """Render the Markdown docs snapshot page (generate_snapshot) from the
+        already-acquired files instead of fetching them again."""
+        import generate_snapshot
+
+        cfg = next((c for c in generate_snapshot.CONFIG if c.slug == project_id), None)
+        if cfg is None:
+            return False
+        fetched = {}
+        for doc in cfg.docs:
+            text = snapshot.readme if doc.path == snapshot.readme_path else snapshot.source.read(doc.path)
+            fetched[generate_snapshot.doc_key(cfg, doc)] = (
+                text if text is not None else FileNotFoundError(f"{doc.path} not found in {snapshot.source.label}")
+            )
+        # write_stamped renders with today's stamp and, to see whether that
+        # is the only change, with the one already on disk.
+        today = generate_snapshot.today_stamp()
+        paths = {
+            name: os.path.join(self.output_dir, project_id, name)
+            for name in generate_snapshot.page_renderers(cfg, fetched, self.split_docs, DOCS_PAGE_FILENAME)
+        }
+        stamps = {name: {today, read_stamp(path, generate_snapshot.STAMP_RE) or today} for name, path in paths.items()}
+        rendered = self._cpu(render_docs_page, project_id, fetched, self.split_docs, stamps, self.caches[1])
+        changed = False
+        for name, path in paths.items():
+            with self._stage(project_id, "write"):
+                wrote = self.writer.write_stamped(path, rendered[name].__getitem__, today, generate_snapshot.STAMP_RE)
+            self.logs[project_id].append(f"   ✓ {name}" + ("" if wrote else " (unchanged)"))
+            changed = wrote or changed
+        return changed
+
+    def graph(self):
+        g = BuildGraph()
+        for project_id in self.projects:
+            source = self.sources[project_id]
+            acq = g.add(f"acquire:{project_id}", lambda s=source, p=project_id: self.acquire(p, s))
+            parse = g.add(f"parse:{project_id}", lambda snap, p=project_id: self.parse(p, snap), [acq])
+            render = g.add(f"render:{project_id}", lambda r, p=project_id: self.render(p, r), [parse])
+            assets = g.add(f"assets:{project_id}", lambda r, p=project_id: self.assets(p, r), [parse])
+            pages = g.add(f"pages:{project_id}", lambda r, names, p=project_id: self.pages(p, r, names), [parse, assets])
+            g.add(
+                f"write:{project_id}",
+                lambda r, chunks, names, pages, p=project_id: self.write(p, r, chunks, names, pages),
+                [parse, render, assets, pages],
+            )
+            if self.docs_pages:
+                g.add(f"docs-page:{project_id}", lambda snap, p=project_id: self.docs_page(p, snap), [acq])
+        return g
+
+    def run(self, jobs=DEFAULT_JOBS):
+        """Build every project; jobs is both the I/O thread count and the
+        worker process count (jobs <= 1 does everything inline)."""
+        doc_pages.write_stylesheet(self.writer, self.output_dir)
+        workers = min(jobs, len(self.projects))
+        # spawn, not fork: the pool starts workers while I/O threads run.
+        pool = (
+            ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            if workers > 1
+            else nullcontext()
+        )
+        with pool:
+            self._pool = pool if workers > 1 else None
+            try:
+                results, errors = self.graph().run(jobs)
+            finally:
+                self._pool = None
+        failed = []
+        for project_id in self.projects:
+            # Report the first real failure; UpstreamFailed just echoes it.
+            for stage in ("acquire", "parse", "render", "assets", "pages", "write", "docs-page"):
+                error = errors.get(f"{stage}:{project_id}")
+                if error is not None and not isinstance(error, UpstreamFailed):
+                    if stage == "acquire" and isinstance(error, FileNotFoundError):
+                        self.logs[project_id].append(f"   ⚠️  {error}")
+                    else:
+                        self.logs[project_id].append(f"   ❌ {stage} failed: {type(error).__name__}: {error}")
+                        failed.append(project_id)
+                    break
+
+        # Skipped or failed projects keep their previous cache entry.
+        new_cache = dict(self.build_cache)
+        for project_id in self.projects:
+            if f"write:{project_id}" in results:
+                new_cache[project_id] = self.keys[project_id]
+        save_build_cache(new_cache, self.writer, self.cache_path)
+        built = sum(1 for p in self.projects if results.get(f"write:{p}") is True)
+        parsed = [results[f"parse:{p}"] for p in self.projects if f"parse:{p}" in results]
+        skipped = sum(1 for p in parsed if p.skip)
+        self.profiler.cache("build", skipped, len(parsed) - skipped)
+        pages = self.profiler.stage_total("pages")
+        self.profiler.cache("doc-pages", pages.cache_hits, pages.cache_misses)
+        if self.docs_pages:
+            markdown = self.profiler.stage_total("markdown")
+            self.profiler.cache("highlight", markdown.cache_hits, markdown.cache_misses)
+        return built, failed
+
+
+def make_sources(args, projects, client=None, cache=None):
+    overrides = dict(item.split("=", 1) for item in args.map)
+    sources = {}
+    for project_id, config in projects.items():
+        name = overrides.get(config["repo_name"], config["repo_name"])
+        if args.source == "checkout":
+            sources[project_id] = CheckoutSource(os.path.join(args.repos_dir or REPOS_DIR, name))
+        elif args.source == "local":
+            sources[project_id] = DirectorySource(os.path.join(args.repos_dir or LOCAL_REPOS_ROOT, name))
+        else:
+            sources[project_id] = HttpSource(OWNER, name, args.ref, client, cache)
+    return sources
+
+
+def profile_project(project_id, config, source, out_dir, docs_pages=False, split_docs=False):
+    """Rebuild one project from scratch under cProfile and tracemalloc.
+
+    The rebuild goes to a throwaway directory with --force semantics and no
+    render or highlight disk caches, so the profile covers every stage, not a
+    cache hit."""
+    with tempfile.TemporaryDirectory(prefix="profile-") as tmp:
+        build = SiteBuild(
+            {project_id: config},
+            {project_id: source},
+            output_dir=os.path.join(tmp, "projects"),
+            force=True,
+            docs_pages=docs_pages,
+            split_docs=split_docs,
+            caches=(None, None),
+        )
+        return profile_call(lambda: build.run(1), out_dir, f"profile-{project_id}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build every projects/ page in one pass")
+    parser.add_argument(
+        "--source",
+        choices=("checkout", "local", "http"),
+        default="checkout",
+        help="checkout: _repos/<Repo> (CI); local: clones next to this repo; http: raw.githubusercontent.com",
+    )
+    parser.add_argument("--repos-dir", help="directory holding the repo checkouts/clones")
+    parser.add_argument(
+        "--map",
+        action="append",
+        default=[],
+        metavar="REPO=DIR",
+        help="use DIR (or repo name, for http) for REPO, e.g. OpenIntelligence=OpenIntelligence-Public",
+    )
+    parser.add_argument("--ref", default="main", help="git ref for --source http")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--only", action="append", default=[], metavar="PROJECT", help="build only these projects")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"worker processes for parsing/rendering, and I/O threads (0 = one per CPU, default {DEFAULT_JOBS})",
+    )
+    parser.add_argument("--force", action="store_true", help="ignore the build cache and rebuild every project")
+    parser.add_argument(
+        "--docs-pages",
+        action="store_true",
+        help=f"also render each project's Markdown docs to {DOCS_PAGE_FILENAME} (needs markdown)",
+    )
+    parser.add_argument(
+        "--split-docs",
+        action="store_true",
+        help=f"with --docs-pages: {DOCS_PAGE_FILENAME} is a doc index and each doc gets its own page",
+    )
+    parser.add_argument(
+        "--require-pygments",
+        action="store_true",
+        help="fail instead of warning when Pygments is missing (CI: keeps cache keys stable across runs)",
+    )
+    parser.add_argument("--report", default=REPORT_PATH, help="where to write the JSON build report")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="re-run the slowest project under cProfile and tracemalloc",
+    )
+    parser.add_argument("--profile-dir", default=PROFILE_DIR, help=f"profile dump directory (default {PROFILE_DIR})")
+    args = parser.parse_args(argv)
+    if args.split_docs and not args.docs_pages:
+        parser.error("--split-docs needs --docs-pages")
+
+    projects = {p: c for p, c in PROJECTS.items() if not args.only or p in args.only}
+    unknown = set(args.only) - set(PROJECTS)
+    if unknown:
+        parser.error(f"unknown project(s): {', '.join(sorted(unknown))}")
+
+    print("🚀 Site build")
+    print(f"   Source: {args.source}")
+    print(f"   Output dir: {args.output_dir}")
+    print(f"   Highlighter: {highlight.BACKEND}")
+    if highlight.pygments is None:
+        # Plain output changes every page hash and cache key, so a build
+        # without Pygments rewrites everything a build with it produced.
+        print("⚠️  Pygments is not installed: code blocks are unhighlighted and cached")
+        print("   pages won't match a Pygments build (pip install -r scripts/requirements.txt)")
+        if args.require_pygments:
+            print("❌ --require-pygments given; stopping")
+            return 1
+
+    client = cache = None
+    if args.source == "http":
+        client = HttpClient(headers={"User-Agent": "snapshot-generator"})
+        cache = ResponseCache(DEFAULT_CACHE_DIR)
+    try:
+        sources = make_sources(args, projects, client, cache)
+        build = SiteBuild(
+            projects,
+            sources,
+            output_dir=args.output_dir,
+            force=args.force,
+            docs_pages=args.docs_pages,
+            split_docs=args.split_docs,
+        )
+        built, failed = build.run(args.jobs or os.cpu_count() or 1)
+        if cache is not None:
+            build.profiler.cache("http", cache.hits, cache.misses)
+        slowest = build.profiler.slowest_project()
+        if args.profile and slowest:
+            profile_project(
+                slowest, projects[slowest], sources[slowest], args.profile_dir, args.docs_pages, args.split_docs
+            )
+    finally:
+        if client is not None:
+            client.close()
+
+    for project_id, config in projects.items():
+        print(f"\n📦 {config['title']}...")
+        if build.logs[project_id]:
+            print("\n".join(build.logs[project_id]))
+    build.writer.export_github_output()
+
+    print(f"\n✅ Done! {built} built, {len(projects) - built - len(failed)} unchanged or not found")
+    print(f"   Files: {build.writer.summary()}")
+    for path in build.writer.changed:
+        print(f"     ~ {path}")
+    build.profiler.write_report(args.report, jobs=args.jobs, source=args.source, built=built, failed=failed)
+    print(f"   Report: {args.report} (slowest: {slowest})")
+    print(build.profiler.summary())
+    if args.profile and slowest:
+        print(f"   Profile: {os.path.join(args.profile_dir, 'profile-' + slowest)}.*")
+    if failed:
+        print(f"❌ {len(failed)} project(s) failed: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
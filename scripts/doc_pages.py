@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Static HTML pages for each project's mirrored Markdown docs.
+Every docs/*.md (README first) becomes docs/<name>.html with a per-doc table
+of contents and previous/next links; all pages share projects/docs.css, so
+each page is just its content. Markdown goes through the parse-once
+md_document model, and the rendered body + TOC are memoized on disk by a
+hash of the source text, so unchanged docs are never re-rendered; pages are
+written through OutputWriter, so unchanged output is never rewritten either.
+The cache keeps one directory per renderer version (a hash of the rendering
+code) and drops the others, so code edits don't leave dead entries behind;
+entries unused for output_writer.CACHE_MAX_AGE are dropped too.
+Link targets are limited to http(s), mailto, fragments and site paths;
+javascript:, data: and other schemes become dead "#" links. Raw HTML in a doc
+is cut down to md_document's allow-list of tags and attributes, and its
+href/src values go through the same check.
+Pure Python stdlib (Pygments highlighting when installed).
+"""
+
+import hashlib
+import html
+import json
+import os
+import posixpath
+import threading
+
+import highlight
+import md_document
+from highlight import Highlighter
+from output_writer import AtomicFile, prune_cache
+from project_page import Template
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_CACHE_DIR = os.path.join(ROOT, ".cache", "doc-pages")
+STYLESHEET_NAME = "docs.css"  # lives in the projects/ root, shared by every page
+INDEX_DOC = "README.md"
+DEAD_LINK = "#"
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp")
+
+STYLESHEET = """:root {
+    --bg-primary: #0a0a0f; --bg-secondary: #12121a; --bg-card: #1a1a24;
+    --text-primary: #fff; --text-secondary: #a0a0b0; --border-color: #2a2a3a;
+}
+* { box-sizing: border-box; }
+body { margin: 0; font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif; background: var(--bg-primary); color: var(--text-primary); line-height: 1.7; }
+a { color: var(--accent); }
+.doc-nav { position: sticky; top: 0; display: flex; justify-content: space-between; gap: 1rem; padding: 0.9rem 2rem; background: rgba(10,10,15,0.95); border-bottom: 1px solid var(--border-color); z-index: 10; }
+.doc-nav a { color: var(--text-secondary); text-decoration: none; }
+.doc-nav a:hover { color: var(--accent); }
+.doc-layout { display: grid; grid-template-columns: 240px minmax(0, 1fr); gap: 3rem; max-width: 1200px; margin: 0 auto; padding: 2.5rem 2rem; }
+.toc { position: sticky; top: 4.5rem; align-self: start; max-height: calc(100vh - 6rem); overflow-y: auto; font-size: 0.88rem; }
+.toc ul { list-style: none; margin: 0; padding: 0; }
+.toc li { margin: 0.3rem 0; }
+.toc .toc-h3 { padding-left: 1rem; }
+.toc a { color: var(--text-secondary); text-decoration: none; }
+.toc a:hover { color: var(--accent); }
+.doc-body h1, .doc-body h2, .doc-body h3 { line-height: 1.3; scroll-margin-top: 4.5rem; }
+.doc-body h1 { font-size: 2.2rem; margin-top: 0; }
+.doc-body h2 { border-bottom: 1px solid var(--border-color); padding-bottom: 0.3rem; margin-top: 2.5rem; }
+.doc-body code { background: var(--bg-card); padding: 0.1rem 0.35rem; border-radius: 4px; font-size: 0.9em; }
+.doc-body pre { background: var(--bg-secondary); border: 1px solid var(--border-color); border-radius: 8px; padding: 1rem; overflow-x: auto; }
+.doc-body pre code { background: none; padding: 0; }
+.doc-body .codehilite { margin: 1rem 0; }
+.doc-body table { border-collapse: collapse; display: block; overflow-x: auto; }
+.doc-body th, .doc-body td { border: 1px solid var(--border-color); padding: 0.4rem 0.8rem; }
+.doc-body blockquote { margin: 1rem 0; padding: 0.2rem 1rem; border-left: 3px solid var(--accent); color: var(--text-secondary); }
+.doc-body img { max-width: 100%; }
+.doc-pager { display: flex; justify-content: space-between; gap: 1rem; margin-top: 3rem; padding-top: 1.5rem; border-top: 1px solid var(--border-color); }
+.doc-pager a { text-decoration: none; }
+@media (max-width: 800px) { .doc-layout { grid-template-columns: 1fr; } .toc { position: static; max-height: none; } }
+"""
+
+PAGE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{{title}} · {{project_title}} docs</title>
+    <link rel="stylesheet" href="../../{{stylesheet}}">
+    <style>:root { --accent: {{accent}}; }</style>
+</head>
+<body>
+    <nav class="doc-nav">
+        <a href="../index.html">&larr; {{project_title}}</a>
+        <a href="{{source_url}}" target="_blank">View source on GitHub</a>
+    </nav>
+    <div class="doc-layout">
+        {{toc}}
+        <main class="doc-body">
+{{body}}
+            <nav class="doc-pager">{{prev_link}}{{next_link}}</nav>
+        </main>
+    </div>
+</body>
+</html>
+""")
+
+
+def page_name(doc_name):
+    """docs/<name>.md -> docs/<name>.html"""
+    return os.path.splitext(doc_name)[0] + ".html"
+
+
+def link_rewriter(repo_url, doc_dir):
+    """URL rewriter for a doc that lives in doc_dir of the repo ("" or "docs").
+
+    Relative links to docs/*.md point at their pages; anything else relative
+    (source files, images) points at the file on GitHub. http(s), mailto,
+    fragments and site paths are kept; any other scheme (javascript:, data:,
+    ...) becomes a dead "#" link. Used for Markdown links and for href/src in
+    raw HTML alike."""
+
+    def rewrite(url):
+        probe = md_document.URL_IGNORED_RE.sub("", url)
+        if md_document.SAFE_URL_RE.match(probe):
+            return url
+        if md_document.SCHEME_RE.match(probe):
+            return DEAD_LINK
+        path, hash_, fragment = url.partition("#")
+        full = posixpath.normpath(posixpath.join(doc_dir, path))
+        head, name = posixpath.split(full)
+        if head == "docs" and name.lower().endswith(".md"):
+            return page_name(name) + hash_ + fragment
+        raw = "?raw=true" if name.lower().endswith(IMAGE_SUFFIXES) else ""
+        return f"{repo_url}/blob/main/{full}{raw}{hash_}{fragment}"
+
+    return rewrite
+
+
+def renderer_version():
+    """Hash of the code a rendered body depends on."""
+    h = hashlib.sha256(highlight.BACKEND.encode())
+    for path in (__file__, md_document.__file__, highlight.__file__):
+        with open(os.path.abspath(path), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+class DocRenderer:
+    """Markdown -> {title, toc, body}, memoized on disk by source hash.
+
+    Safe to share between threads and, via the cache directory, between
+    processes (entries are written atomically)."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, highlighter=None):
+        self.highlighter = highlighter or Highlighter()
+        self.version = renderer_version()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.cache_dir = None
+        if cache_dir:
+            self.cache_dir = os.path.join(cache_dir, self.version[:16])
+            os.makedirs(self.cache_dir, exist_ok=True)
+            prune_cache(cache_dir, keep=os.path.basename(self.cache_dir))
+
+    def _key(self, *parts):
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()[:40]
+
+    def render(self, text, fallback_title, repo_url, source_path):
+        """Rendered {title, toc, body} for the doc at source_path in repo_url."""
+        key = self._key(text, fallback_title, repo_url, source_path)
+        path = os.path.join(self.cache_dir, key + ".json") if self.cache_dir else None
+        if path:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    cached = json.load(f)
+                os.utime(path)
+                with self._lock:
+                    self.hits += 1
+                return cached
+            except (OSError, ValueError):
+                pass
+
+        doc = md_document.parse(text)
+        h1 = next((h.text for h in doc.headings if h.level == 1), None)
+        rendered = {
+            "title": h1 or fallback_title,
+            "toc": doc.toc_html(),
+            "body": doc.to_html(self.highlighter, link=link_rewriter(repo_url, posixpath.dirname(source_path))),
+        }
+        with self._lock:
+            self.misses += 1
+        if path:
+            with AtomicFile(path, "w", encoding="utf-8") as out:
+                json.dump(rendered, out.file)
+        return rendered
+
+    def summary(self):
+        return f"doc pages: {self.hits} cached, {self.misses} rendered"
+
+
+def _pager_link(rendered, name, rel):
+    if name is None:
+        return "<span></span>"
+    title = html.escape(rendered["title"])
+    label = f"&larr; {title}" if rel == "prev" else f"{title} &rarr;"
+    return f'<a href="{page_name(name)}" rel="{rel}">{label}</a>'
+
+
+def ordered_docs(docs):
+    """README first, then the other docs by name."""
+    return sorted(docs, key=lambda name: (name != INDEX_DOC, name))
+
+
+def _source_path(name, readme_path):
+    return readme_path if name == INDEX_DOC else f"docs/{name}"
+
+
+def render_docs(renderer, config, docs, readme_path=INDEX_DOC):
+    """Render docs ({name.md: text}) to {name.md: {title, toc, body}}, in
+    page order. readme_path is where README.md came from in the repo."""
+    return {
+        name: renderer.render(
+            docs[name], os.path.splitext(name)[0], config["github_url"], _source_path(name, readme_path)
+        )
+        for name in ordered_docs(docs)
+    }
+
+
+def write_doc_pages(writer, config, docs_dir, rendered, previous=(), readme_path=INDEX_DOC):
+    """Write render_docs() output as pages in docs_dir.
+
+    readme_path is where README.md came from in the repo (for its source
+    link). previous lists page names written last time (manifest "pages");
+    those whose doc is gone are deleted. Returns the page names, in order."""
+    names = list(rendered)
+    sources = {name: _source_path(name, readme_path) for name in names}
+    pages = []
+    for i, name in enumerate(names):
+        prev_name = names[i - 1] if i > 0 else None
+        next_name = names[i + 1] if i + 1 < len(names) else None
+        r = rendered[name]
+        chunks = PAGE.stream(
+            title=html.escape(r["title"]),
+            project_title=html.escape(config["title"]),
+            stylesheet=STYLESHEET_NAME,
+            accent=config["accent_color"],
+            source_url=html.escape(f"{config['github_url']}/blob/main/{sources[name]}"),
+            toc=r["toc"],
+            body=r["body"],
+            prev_link=_pager_link(rendered.get(prev_name), prev_name, "prev"),
+            next_link=_pager_link(rendered.get(next_name), next_name, "next"),
+        )
+        writer.write(os.path.join(docs_dir, page_name(name)), chunks)
+        pages.append(page_name(name))
+
+    for name in sorted(set(previous) - set(pages)):
+        path = os.path.join(docs_dir, name)
+        if os.path.isfile(path):
+            os.unlink(path)
+            writer.record(path, True)
+    return pages
+
+
+def write_stylesheet(writer, output_dir):
+    return writer.write(os.path.join(output_dir, STYLESHEET_NAME), STYLESHEET)
+
+
+def previous_pages(output_dir):
+    """Page names the previous run wrote, as recorded in manifest.json."""
+    try:
+        with open(os.path.join(output_dir, "manifest.json"), "r", encoding="utf-8") as f:
+            return json.load(f).get("pages", [])
+    except (FileNotFoundError, ValueError):
+        return []
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the parts of api.github.com that fetch_stats.py uses.
+Serves repo metadata, paginated /commits (with Link headers) and the batched
+GraphQL history query, from either a stats fixture (a shard index such as
+data/stats/index.json) or synthetic histories generated on demand, so 1M-commit repos cost
+no memory. Emits X-RateLimit-* headers and ETags (If-None-Match -> 304), and
+lets callers inject errors and latency.
+
+Usage:
+    python3 scripts/fake_github.py --synthetic 10000 --port 8700
+    GITHUB_API_URL=http://127.0.0.1:8700 python3 scripts/fetch_stats.py
+
+Pure Python stdlib.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import hashlib
+import http.server
+import json
+import os
+import random
+import re
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+DEFAULT_REPOS = [
+    "OpenClinic",
+    "OpenResponses",
+    "OpenIntelligence",
+    "PlaudBlender",
+    "OpenCone",
+    "OpenAssistant",
+]
+EPOCH = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+UNAUTH_LIMIT = 60
+AUTH_LIMIT = 5000
+
+_GRAPHQL_REPO = re.compile(
+    r'(\w+): repository\(owner: "[^"]*", name: "([^"]+)"\) \{(.*?)defaultBranchRef'
+    r'.*?history\(first: (\d+)(?:, after: "([^"]*)")?\)'
+)
+
+
+@dataclass
+class FakeRepo:
+    """A repo whose commits are either a fixture list or synthesised by index.
+
+    Index 0 is the oldest commit; the API lists newest first. `generation`
+    changes every SHA, simulating a force-push that rewrites history."""
+
+    name: str
+    count: int = 0
+    fixture: Optional[List[dict]] = None
+    generation: int = 0
+    created_at: str = "2024-01-01T00:00:00Z"
+    description: Optional[str] = None
+    stars: int = 0
+
+    def total(self) -> int:
+        return len(self.fixture) if self.fixture is not None else self.count
+
+    def commit(self, index: int) -> dict:
+        """Commit by age index, as the REST API shapes it."""
+        if self.fixture is not None:
+            c = self.fixture[len(self.fixture) - 1 - index]
+            message, date, author, sha = c["message"], c["date"], c["author"], c["sha"]
+            if self.generation:
+                sha = hashlib.sha1(f"{sha}:{self.generation}".encode()).hexdigest()
+        else:
+            sha = hashlib.sha1(f"{self.name}:{self.generation}:{index}".encode()).hexdigest()
+            when = EPOCH + dt.timedelta(minutes=37 * index)
+            date = when.strftime("%Y-%m-%dT%H:%M:%SZ")
+            message = f"feat: synthetic change {index} in {self.name}\n\nBody line."
+            author = "fake-author"
+        return {
+            "sha": sha,
+            "commit": {"message": message, "author": {"name": author, "date": date}},
+        }
+
+    def newest_first(self, offset: int, limit: int) -> List[dict]:
+        top = self.total() - 1 - offset
+        return [self.commit(i) for i in range(top, max(top - limit, -1), -1)]
+
+    def info(self) -> dict:
+        return {
+            "name": self.name,
+            "created_at": self.created_at,
+            "description": self.description,
+            "stargazers_count": self.stars,
+        }
+
+
+@dataclass
+class Injection:
+    pattern: str
+    status: int
+    remaining: int
+    retry_after: Optional[int] = None
+
+
+@dataclass
+class FakeGitHub:
+    """In-process server; start() returns the base URL to use as GITHUB_API_URL."""
+
+    repos: Dict[str, FakeRepo] = field(default_factory=dict)
+    owner: str = "Gunnarguy"
+    latency: float = 0.0
+    error_rate: float = 0.0
+    rate_limit: Optional[int] = None
+    window: int = 3600
+
+    def __post_init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_sent = 0
+        self.injections: List[Injection] = []
+        self._used: Dict[str, int] = {}
+        self._reset = int(time.time()) + self.window
+        self._server: Optional[http.server.ThreadingHTTPServer] = None
+        self._rng = random.Random(1234)
+
+    # -- fixtures ------------------------------------------------------------
+
+    @classmethod
+    def synthetic(cls, commits: int, repos=DEFAULT_REPOS, **kwargs) -> "FakeGitHub":
+        return cls(repos={name: FakeRepo(name, count=commits) for name in repos}, **kwargs)
+
+    @classmethod
+    def from_stats(cls, path: str, **kwargs) -> "FakeGitHub":
+        """Serve the repos listed in a fetch_stats shard index."""
+        with open(path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        repos = {}
+        for name, entry in index["shards"].items():
+            with open(os.path.join(os.path.dirname(path), entry["path"]), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            repos[name] = FakeRepo(
+                name,
+                fixture=list(data["commits"]),
+                created_at=data["created_at"],
+                description=data.get("description"),
+                stars=data.get("stars", 0),
+            )
+        return cls(repos=repos, **kwargs)
+
+    def add_commits(self, repo: str, n: int) -> None:
+        """Push n new commits on top of repo's history."""
+        target = self.repos[repo]
+        with self.lock:
+            if target.fixture is None:
+                target.count += n
+                return
+            now = dt.datetime.now(dt.timezone.utc)
+            for _ in range(n):
+                index = target.total()
+                target.fixture.insert(0, {
+                    "sha": hashlib.sha1(f"{repo}:pushed:{index}".encode()).hexdigest(),
+                    "message": f"fix: pushed change {index}",
+                    "date": (now + dt.timedelta(seconds=index)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    "author": "fake-author",
+                })
+
+    def rewrite_history(self, repo: str) -> None:
+        """Change every SHA in repo, as a force-push would."""
+        with self.lock:
+            self.repos[repo].generation += 1
+
+    def inject(self, pattern: str, status: int, times: int = 1, retry_after: Optional[int] = None) -> None:
+        """Answer the next `times` requests whose path contains pattern with status."""
+        with self.lock:
+            self.injections.append(Injection(pattern, status, times, retry_after))
+
+    # -- lifecycle -------------------------------------------------------------
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        fake = self
+
+        class Handler(_Handler):
+            server_state = fake
+
+        self._server = http.server.ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return f"http://{host}:{self._server.server_address[1]}"
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    # -- request accounting ------------------------------------------------------
+
+    def _quota(self, auth: bool):
+        limit = self.rate_limit or (AUTH_LIMIT if auth else UNAUTH_LIMIT)
+        key = "auth" if auth else "anon"
+        with self.lock:
+            now = time.time()
+            if now >= self._reset:
+                self._used = {}
+                self._reset = int(now) + self.window
+            return key, limit, self._used.get(key, 0)
+
+    def _spend(self, key: str) -> None:
+        with self.lock:
+            self._used[key] = self._used.get(key, 0) + 1
+
+    def _injected(self, path: str) -> Optional[Injection]:
+        with self.lock:
+            for inj in self.injections:
+                if inj.remaining > 0 and inj.pattern in path:
+                    inj.remaining -= 1
+                    return inj
+            if self.error_rate and self._rng.random() < self.error_rate:
+                return Injection(path, 502, 0)
+        return None
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_state: FakeGitHub
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _send(self, status: int, payload, extra: Optional[Dict[str, str]] = None, quota=None) -> None:
+        fake = self.server_state
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        headers = dict(extra or {})
+        if quota is not None:
+            key, limit, used = quota
+            headers.update({
+                "X-RateLimit-Limit": str(limit),
+                "X-RateLimit-Remaining": str(max(limit - used, 0)),
+                "X-RateLimit-Used": str(used),
+                "X-RateLimit-Reset": str(fake._reset),
+            })
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        with fake.lock:
+            fake.requests += 1
+            fake.bytes_sent += len(body)
+            if status == 304:
+                fake.not_modified += 1
+
+    def _preflight(self):
+        """Apply latency, injected errors and the rate limit. Returns quota or None."""
+        fake = self.server_state
+        if fake.latency:
+            time.sleep(fake.latency)
+        quota = fake._quota(bool(self.headers.get("Authorization")))
+        inj = fake._injected(self.path)
+        if inj is not None:
+            extra = {"Retry-After": str(inj.retry_after)} if inj.retry_after is not None else {}
+            message = "You have exceeded a secondary rate limit" if inj.status in (403, 429) else "injected error"
+            self._send(inj.status, {"message": message}, extra, quota)
+            return None
+        key, limit, used = quota
+        if used >= limit:
+            self._send(403, {"message": "API rate limit exceeded"}, quota=(key, limit, used))
+            return None
+        return quota
+
+    def _send_cacheable(self, payload, quota, extra=None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        headers = {"ETag": etag, **(extra or {})}
+        if self.headers.get("If-None-Match") == etag:
+            # Conditional hits don't count against GitHub's quota.
+            self._send(304, b"", headers, quota)
+            return
+        self.server_state._spend(quota[0])
+        key, limit, used = quota
+        self._send(200, body, headers, (key, limit, used + 1))
+
+    def do_GET(self) -> None:
+        fake = self.server_state
+        parts = urllib.parse.urlsplit(self.path)
+        segs = [s for s in parts.path.split("/") if s]
+        quota = self._preflight()
+        if quota is None:
+            return
+        if len(segs) < 3 or segs[0] != "repos" or segs[2] not in fake.repos:
+            self._send(404, {"message": "Not Found"}, quota=quota)
+            return
+        repo = fake.repos[segs[2]]
+        if len(segs) == 3:
+            self._send_cacheable(repo.info(), quota)
+            return
+        if segs[3] != "commits":
+            self._send(404, {"message": "Not Found"}, quota=quota)
+            return
+        query = urllib.parse.parse_qs(parts.query)
+        per_page = min(int(query.get("per_page", ["30"])[0]), 100)
+        page = max(int(query.get("page", ["1"])[0]), 1)
+        with fake.lock:
+            commits = repo.newest_first((page - 1) * per_page, per_page)
+            last = max((repo.total() + per_page - 1) // per_page, 1)
+        base = f"http://{self.headers.get('Host')}{parts.path}?per_page={per_page}"
+        links = []
+        if page < last:
+            links.append(f'<{base}&page={page + 1}>; rel="next"')
+            links.append(f'<{base}&page={last}>; rel="last"')
+        extra = {"Link": ", ".join(links)} if links else None
+        self._send_cacheable(commits, quota, extra)
+
+    def do_POST(self) -> None:
+        fake = self.server_state
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length)
+        quota = self._preflight()
+        if quota is None:
+            return
+        if urllib.parse.urlsplit(self.path).path.rstrip("/") != "/graphql":
+            self._send(404, {"message": "Not Found"}, quota=quota)
+            return
+        if not self.headers.get("Authorization"):
+            self._send(401, {"message": "This endpoint requires you to be authenticated."}, quota=quota)
+            return
+        query = json.loads(raw or b"{}").get("query", "")
+        data, errors = {}, []
+        for alias, name, meta, first, after in _GRAPHQL_REPO.findall(query):
+            repo = fake.repos.get(name)
+            if repo is None:
+                data[alias] = None
+                errors.append({"path": [alias], "message": f"Could not resolve to a Repository with the name '{name}'."})
+                continue
+            offset, first_n = int(after or 0), min(int(first), 100)
+            with fake.lock:
+                nodes = repo.newest_first(offset, first_n)
+                has_next = offset + first_n < repo.total()
+            entry = {
+                "defaultBranchRef": {"target": {"history": {
+                    "pageInfo": {"hasNextPage": has_next, "endCursor": str(offset + len(nodes))},
+                    "nodes": [
+                        {
+                            "oid": c["sha"],
+                            "message": c["commit"]["message"],
+                            "author": {
+                                "name": c["commit"]["author"]["name"],
+                                "date": c["commit"]["author"]["date"].replace("Z", "+00:00"),
+                            },
+                        }
+                        for c in nodes
+                    ],
+                }}}
+            }
+            if meta.strip():
+                entry.update({
+                    "createdAt": repo.created_at,
+                    "description": repo.description,
+                    "stargazerCount": repo.stars,
+                })
+            data[alias] = entry
+        fake._spend(quota[0])
+        payload = {"data": data}
+        if errors:
+            payload["errors"] = errors
+        self._send(200, payload, quota=quota)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve a fake GitHub API for fetch_stats.py")
+    parser.add_argument("--port", type=int, default=8700)
+    parser.add_argument("--fixture", help="shard index to serve (e.g. data/stats/index.json)")
+    parser.add_argument("--synthetic", type=int, default=1000, help="commits per synthetic repo")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered 502")
+    parser.add_argument("--rate-limit", type=int, help="override the per-window request quota")
+    args = parser.parse_args(argv)
+
+    options = dict(latency=args.latency, error_rate=args.error_rate, rate_limit=args.rate_limit)
+    if args.fixture:
+        fake = FakeGitHub.from_stats(args.fixture, **options)
+    else:
+        fake = FakeGitHub.synthetic(args.synthetic, **options)
+    url = fake.start(port=args.port)
+    print(f"Fake GitHub API on {url} ({len(fake.repos)} repos)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fake.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
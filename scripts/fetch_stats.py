@@ -1,7 +1,52 @@
 #!/usr/bin/env python3
-"""Fetch GitHub stats locally and write data/github-stats.json.
-Uses gh CLI token if available for 5000 req/hr instead of 60."""
-import json, urllib.request, datetime, sys, subprocess
+"""Fetch GitHub stats locally and write data/stats/<repo>.json shards.
+Uses gh CLI token if available for 5000 req/hr instead of 60.
+
+The committed source of truth is one shard per repo in data/stats/, listed in
+data/stats/index.json with its content hash, size and commit count. Shards
+are written one commit per line, so a new commit is a one-line diff in one
+file. By default the existing shards are used as a baseline and only
+commits newer than each repo's newest known SHA are requested (usually one
+page per repo). A repo falls back to a full resync when its known head is no
+longer in the branch history (force-push / rewrite). Pass --full to resync
+every repo from scratch.
+
+Repos are fetched concurrently (--jobs) over pooled keep-alive connections;
+each repo's shard is written as its fetch completes, and the index, rollup
+and printed summary stay in REPOS order. Set GITHUB_API_URL to point at a local stand-in.
+
+The fetch logic is importable: StatsFetcher.iter_results() streams one
+RepoResult per repo as it completes, and update_stats() is what the CLI (and
+the update-stats workflow) runs on top of it.
+
+Responses are kept in an ETag cache (--cache-dir) and revalidated with
+conditional requests; 304 answers don't count against the rate limit.
+
+Alongside the shards a small data/github-rollup.json is written with
+pre-bucketed daily/weekly commit counts and a recent-activity feed, so the
+homepage heatmap can paint without downloading every commit.
+--derived-only rebuilds the rollup and rewrites the shards from the existing
+shards without touching the network.
+
+--backend graphql fetches metadata and history for every repo in one aliased
+GraphQL query per page cursor (needs a token); output is identical to REST.
+
+Every request goes through a rate-limit scheduler that reads GitHub's quota
+headers, holds back enough requests for repos that haven't started, and
+backs off on secondary limits / 5xx. A repo that still fails keeps its last
+good data instead of dropping out of the output.
+
+Change detection compares a sha256 of each repo's canonical JSON against the
+hashes stored in the shard index, prints a per-repo changed/unchanged
+summary, and exits with status 3 (EXIT_UNCHANGED) when nothing changed so
+callers can skip downstream work."""
+import argparse, collections, json, datetime, hashlib, heapq, itertools, os, sys, subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from http_cache import DEFAULT_MAX_BYTES, ResponseCache
+from http_client import HTTPError, HttpClient
+from output_writer import write_if_changed
+from rate_limit import DEFAULT_MAX_WAIT, RateLimitScheduler
 
 OWNER = "Gunnarguy"
 REPOS = [
@@ -13,80 +58,631 @@ REPOS = [
     "OpenAssistant",
 ]
 
-# Try to get auth token from gh CLI
-token = None
-try:
-    token = (
-        subprocess.check_output(["gh", "auth", "token"], stderr=subprocess.DEVNULL)
-        .decode()
-        .strip()
-    )
-    print("Using authenticated token (5000 req/hr)")
-except Exception:
-    print("No gh token found, using unauthenticated (60 req/hr)")
+API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+ROLLUP_PATH = "data/github-rollup.json"
+SHARD_DIR = "data/stats"
+SHARD_INDEX = "index.json"
+EXIT_UNCHANGED = 3
+RECENT_LIMIT = 20
+PER_PAGE = 100
+MAX_PAGES = 0  # no cap; incremental runs normally stop after the first page
+DEFAULT_JOBS = 4
+GRAPHQL_URL = os.environ.get("GITHUB_GRAPHQL_URL", f"{API_URL}/graphql")
+DEFAULT_CACHE_DIR = os.environ.get("STATS_CACHE_DIR", ".cache/github-api")
 
+RepoResult = collections.namedtuple("RepoResult", "repo data mode error")
 
-def gh_get(url):
-    headers = {"Accept": "application/vnd.github.v3+json"}
-    if token:
-        headers["Authorization"] = f"token {token}"
-    req = urllib.request.Request(url, headers=headers)
-    with urllib.request.urlopen(req) as resp:
-        return json.loads(resp.read())
 
+def get_token():
+    """Return GITHUB_TOKEN or a token from the gh CLI, or None to run unauthenticated."""
+    if os.environ.get("GITHUB_TOKEN"):
+        print("Using GITHUB_TOKEN")
+        return os.environ["GITHUB_TOKEN"]
+    try:
+        value = (
+            subprocess.check_output(["gh", "auth", "token"], stderr=subprocess.DEVNULL)
+            .decode()
+            .strip()
+        )
+        print("Using authenticated token (5000 req/hr)")
+        return value
+    except Exception:
+        print("No gh token found, using unauthenticated (60 req/hr)")
+        return None
 
-result = {"repos": {}}
 
-for repo in REPOS:
-    print(f"Fetching {repo}...", end=" ")
-    try:
-        info = gh_get(f"https://api.github.com/repos/{OWNER}/{repo}")
-        all_commits = []
+def slim_commit(c):
+    return {
+        "sha": c["sha"],
+        "message": c["commit"]["message"].split("\n")[0],
+        "date": c["commit"]["author"]["date"],
+        "author": c["commit"]["author"]["name"],
+    }
+
+
+def find_new_commits(pages, known_commits):
+    """Return (fresh, late) commits missing from known_commits, or None if the
+    known head is no longer reachable (history rewritten) and a full resync
+    is needed.
+
+    Pages are walked newest-first until the known head SHA shows up. Unknown
+    commits listed on the same page after the head (merged side branches with
+    older dates) are kept as well."""
+    known_shas = {c["sha"] for c in known_commits}
+    head_sha = known_commits[0]["sha"]
+    fresh = []
+    for page in pages:
+        for i, c in enumerate(page):
+            if c["sha"] == head_sha:
+                late = [x for x in page[i + 1:] if x["sha"] not in known_shas]
+                return fresh, late
+            if c["sha"] not in known_shas:
+                fresh.append(c)
+    return None
+
+
+def merge_commits(known_commits, fresh, late):
+    """Merge newly fetched commits into the known newest-first list."""
+    if not late:
+        return fresh + known_commits
+    merged = fresh + known_commits + late
+    merged.sort(key=lambda c: c["date"], reverse=True)
+    return merged
+
+
+def apply_history(known, pages):
+    """Return (commits, mode) from known commits plus newest-first pages.
+
+    pages may be lazy; when the known head is found it stops consuming them.
+    Otherwise every page is read as a full resync."""
+    pages = iter(pages)
+    if known:
+        seen = []
+
+        def recorded():
+            for page in pages:
+                seen.append(page)
+                yield page
+
+        delta = find_new_commits(recorded(), known)
+        if delta is not None:
+            fresh, late = delta
+            return merge_commits(known, fresh, late), f"+{len(fresh) + len(late)}"
+        return [c for page in seen for c in page], "full (history rewritten)"
+    return [c for page in pages for c in page], "full"
+
+
+def utc_timestamp(value):
+    """Normalise a GitTimestamp (may carry an offset) to REST's ...Z form."""
+    parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed.astimezone(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class StatsFetcher:
+    """Fetches repo metadata + commit history from the GitHub API.
+
+    Usable as a library: iter_results() yields a RepoResult per repo as soon
+    as that repo is done, so callers can write or hand on finished repos while
+    slower ones are still paginating."""
+
+    def __init__(
+        self,
+        owner=OWNER,
+        repos=REPOS,
+        token=None,
+        api_url=API_URL,
+        graphql_url=GRAPHQL_URL,
+        cache=None,
+        scheduler=None,
+        max_pages=MAX_PAGES,
+        client=None,
+    ):
+        self.owner = owner
+        self.repos = list(repos)
+        self.token = token
+        self.api_url = api_url.rstrip("/")
+        self.graphql_url = graphql_url
+        self.cache = cache
+        self.scheduler = scheduler or RateLimitScheduler()
+        self.max_pages = max_pages
+        self.client = client or HttpClient(headers={"User-Agent": "gunnarguy-portfolio-stats"})
+        self.scheduler.plan(self.repos)
+
+    def close(self):
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- REST --------------------------------------------------------------
+
+    def get(self, url):
+        headers = {"Accept": "application/vnd.github.v3+json"}
+        if self.token:
+            headers["Authorization"] = f"token {self.token}"
+        if self.cache is not None:
+            resp = self.scheduler.run(lambda: self.cache.fetch(self.client, url, headers=headers))
+        else:
+            resp = self.scheduler.run(lambda: self.client.get(url, headers=headers))
+        return json.loads(resp.body)
+
+    def commit_pages(self, repo):
+        """Yield pages of slimmed commits, newest first (max_pages=0: no cap)."""
         page = 1
-        while page <= 20:
-            commits = gh_get(
-                f"https://api.github.com/repos/{OWNER}/{repo}/commits?per_page=100&page={page}"
+        while not self.max_pages or page <= self.max_pages:
+            commits = self.get(
+                f"{self.api_url}/repos/{self.owner}/{repo}/commits?per_page={PER_PAGE}&page={page}"
             )
             if not commits:
-                break
-            for c in commits:
-                all_commits.append(
-                    {
-                        "sha": c["sha"],
-                        "message": c["commit"]["message"].split("\n")[0],
-                        "date": c["commit"]["author"]["date"],
-                        "author": c["commit"]["author"]["name"],
-                    }
-                )
-            if len(commits) < 100:
-                break
+                return
+            yield [slim_commit(c) for c in commits]
+            if len(commits) < PER_PAGE:
+                return
             page += 1
-        result["repos"][repo] = {
+
+    def sync_repo(self, repo, previous=None, full=False):
+        """Return (repo_data, mode) for one repo, reusing previous data when possible."""
+        self.scheduler.begin(repo)
+        info = self.get(f"{self.api_url}/repos/{self.owner}/{repo}")
+        known = [] if full else (previous or {}).get("commits") or []
+        commits, mode = apply_history(known, self.commit_pages(repo))
+        return {
             "created_at": info["created_at"],
             "description": info.get("description", ""),
             "stars": info.get("stargazers_count", 0),
-            "commits": all_commits,
+            "commits": commits,
+        }, mode
+
+    # -- GraphQL -----------------------------------------------------------
+
+    def graphql(self, query):
+        """POST a GraphQL query and return (data, errors), raising if no data came back."""
+        headers = {"Content-Type": "application/json", "Authorization": f"bearer {self.token}"}
+        body = json.dumps({"query": query}).encode("utf-8")
+
+        def send():
+            resp = self.client.request(self.graphql_url, headers=headers, method="POST", body=body)
+            if resp.status >= 400:
+                raise HTTPError(resp)
+            return resp
+
+        payload = json.loads(self.scheduler.run(send).body)
+        if payload.get("data") is None:
+            raise RuntimeError(f"GraphQL error: {payload.get('errors')}")
+        return payload["data"], payload.get("errors") or []
+
+    def history_query(self, states, with_meta):
+        """Build one aliased query covering every repo still paginating."""
+        parts = []
+        for alias, state in states:
+            after = f", after: {json.dumps(state['cursor'])}" if state["cursor"] else ""
+            meta = "createdAt description stargazerCount" if with_meta else ""
+            parts.append(
+                f"{alias}: repository(owner: {json.dumps(self.owner)}, name: {json.dumps(state['repo'])}) {{ {meta}"
+                f" defaultBranchRef {{ target {{ ... on Commit {{ history(first: {PER_PAGE}{after}) {{"
+                " pageInfo { hasNextPage endCursor }"
+                " nodes { oid message author { name date } } } } } } }"
+            )
+        return "query {\n  " + "\n  ".join(parts) + "\n}"
+
+    def iter_graphql(self, previous_repos, full=False):
+        """Yield a RepoResult per repo via batched GraphQL, as each one finishes.
+
+        Each round trip asks for the next history page of all repos that still
+        need one. Incremental repos stop as soon as their known head appears;
+        if it never does they keep paginating into a full resync."""
+        states = {}
+        for i, repo in enumerate(self.repos):
+            self.scheduler.begin(repo)
+            known = [] if full else (previous_repos.get(repo) or {}).get("commits") or []
+            states[f"r{i}"] = {"repo": repo, "known": known, "pages": [], "cursor": None, "info": None}
+
+        page_no = 0
+        while states:
+            active = list(states.items())
+            finished = []
+            capped = bool(self.max_pages) and page_no + 1 >= self.max_pages
+            try:
+                data, errors = self.graphql(self.history_query(active, with_meta=page_no == 0))
+            except Exception as e:
+                for _, st in active:
+                    yield RepoResult(st["repo"], None, None, e)
+                return
+            failed = {err.get("path", [None])[0]: err.get("message") for err in errors}
+            for alias, st in active:
+                repo_data = data.get(alias)
+                if not repo_data or not repo_data.get("defaultBranchRef"):
+                    del states[alias]
+                    error = RuntimeError(failed.get(alias) or "repository or default branch not found")
+                    yield RepoResult(st["repo"], None, None, error)
+                    continue
+                if page_no == 0:
+                    st["info"] = repo_data
+                history = repo_data["defaultBranchRef"]["target"]["history"]
+                page = [
+                    {
+                        "sha": n["oid"],
+                        "message": n["message"].split("\n")[0],
+                        "date": utc_timestamp(n["author"]["date"]),
+                        "author": n["author"]["name"],
+                    }
+                    for n in history["nodes"]
+                ]
+                st["pages"].append(page)
+                st["cursor"] = history["pageInfo"]["endCursor"]
+                head = st["known"][0]["sha"] if st["known"] else None
+                if capped or not history["pageInfo"]["hasNextPage"] or any(c["sha"] == head for c in page):
+                    finished.append(alias)
+            for alias in finished:
+                st = states.pop(alias)
+                commits, mode = apply_history(st["known"], st["pages"])
+                info = st["info"]
+                data_out = {
+                    "created_at": info["createdAt"],
+                    "description": info["description"],
+                    "stars": info["stargazerCount"],
+                    "commits": commits,
+                }
+                yield RepoResult(st["repo"], data_out, mode, None)
+            page_no += 1
+
+    # -- streaming API -----------------------------------------------------
+
+    def iter_results(self, previous_repos=None, full=False, jobs=DEFAULT_JOBS, backend="rest", ordered=False):
+        """Yield a RepoResult per repo as each completes (or in repo order if ordered).
+
+        Failures are yielded as results with .error set rather than raised."""
+        previous_repos = previous_repos or {}
+        if backend == "graphql":
+            results = self.iter_graphql(previous_repos, full=full)
+            if ordered:
+                by_repo = {r.repo: r for r in results}
+                results = (by_repo[repo] for repo in self.repos if repo in by_repo)
+            yield from results
+            return
+
+        def task(repo):
+            try:
+                data, mode = self.sync_repo(repo, previous_repos.get(repo), full=full)
+                return RepoResult(repo, data, mode, None)
+            except Exception as e:
+                return RepoResult(repo, None, None, e)
+
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            futures = [pool.submit(task, repo) for repo in self.repos]
+            for future in futures if ordered else as_completed(futures):
+                yield future.result()
+
+
+def load_index(directory=SHARD_DIR):
+    try:
+        with open(os.path.join(directory, SHARD_INDEX), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def load_existing(directory=SHARD_DIR):
+    """Return {"generated", "hashes", "repos"} from the shard index and shards,
+    or None if there is no index. A missing or unreadable shard drops that repo,
+    so the next fetch resyncs it in full."""
+    index = load_index(directory)
+    if index is None:
+        return None
+    hashes, repos = {}, {}
+    for repo, entry in index.get("shards", {}).items():
+        try:
+            with open(os.path.join(directory, entry["path"]), "r", encoding="utf-8") as f:
+                repos[repo] = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            continue
+        hashes[repo] = entry["sha256"]
+    return {"generated": index.get("generated"), "hashes": hashes, "repos": repos}
+
+
+def build_rollup(repos, generated, recent_limit=RECENT_LIMIT):
+    """Pre-aggregate commit counts for the homepage heatmap.
+
+    Daily arrays are indexed by UTC day from base_date (the Sunday on or
+    before the earliest commit) through the latest commit; weekly totals use
+    the same Sunday-aligned buckets. The recent feed is a k-way merge of the
+    repos' newest commits."""
+    days_by_repo = {
+        repo: [datetime.date.fromisoformat(c["date"][:10]) for c in data["commits"]]
+        for repo, data in repos.items()
+    }
+    all_days = [d for days in days_by_repo.values() for d in days]
+    if not all_days:
+        return {"generated": generated, "base_date": None, "days": 0, "repos": {}, "all": {}, "recent": []}
+
+    first, last = min(all_days), max(all_days)
+    base = first - datetime.timedelta(days=(first.weekday() + 1) % 7)
+    span = (last - base).days + 1
+
+    def bucket(days):
+        daily = [0] * span
+        for d in days:
+            daily[(d - base).days] += 1
+        return daily
+
+    rollup_repos = {}
+    all_daily = [0] * span
+    for repo, days in days_by_repo.items():
+        daily = bucket(days)
+        all_daily = [a + b for a, b in zip(all_daily, daily)]
+        rollup_repos[repo] = {
+            "created_at": repos[repo]["created_at"],
+            "stars": repos[repo]["stars"],
+            "total": len(days),
+            "daily": daily,
         }
-        print(f"{len(all_commits)} commits")
-    except Exception as e:
-        print(f"FAILED: {e}")
-
-existing = None
-try:
-    with open("data/github-stats.json", "r") as f:
-        existing = json.load(f)
-except FileNotFoundError:
-    existing = None
-
-if existing and existing.get("repos") == result["repos"]:
-    print("\nNo repo stat changes detected; leaving data/github-stats.json untouched")
-    sys.exit(0)
-
-output = {
-    "generated": datetime.datetime.now(datetime.timezone.utc).isoformat().replace("+00:00", "Z"),
-    "repos": result["repos"],
-}
-
-with open("data/github-stats.json", "w") as f:
-    json.dump(output, f)
-print(f"\nWrote data/github-stats.json ({len(output['repos'])} repos)")
+
+    weekly = [sum(all_daily[i:i + 7]) for i in range(0, span, 7)]
+    # API order is topological, not strictly by date, so take each repo's
+    # newest N first; those sorted runs are then k-way merged.
+    by_date = lambda c: c["date"]
+    feeds = [
+        [
+            {"repo": repo, "sha": c["sha"][:7], "message": c["message"], "date": c["date"]}
+            for c in heapq.nlargest(recent_limit, data["commits"], key=by_date)
+        ]
+        for repo, data in repos.items()
+    ]
+    recent = list(itertools.islice(heapq.merge(*feeds, key=by_date, reverse=True), recent_limit))
+    return {
+        "generated": generated,
+        "base_date": base.isoformat(),
+        "days": span,
+        "repos": rollup_repos,
+        "all": {"total": len(all_days), "daily": all_daily, "weekly": weekly},
+        "recent": recent,
+    }
+
+
+def write_rollup(stats, path=ROLLUP_PATH):
+    rollup = build_rollup(stats["repos"], stats.get("generated"))
+    with open(path, "w") as f:
+        json.dump(rollup, f, separators=(",", ":"))
+    print(f"Wrote {path} ({os.path.getsize(path) / 1024:.1f} KB, {rollup['days']} days)")
+
+
+def canonical_json(value):
+    """Stable serialisation: identical data always yields identical bytes."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def repo_hash(data):
+    return hashlib.sha256(canonical_json(data)).hexdigest()
+
+
+def repo_hashes(repos):
+    return {repo: repo_hash(data) for repo, data in repos.items()}
+
+
+def diff_hashes(old, new):
+    """Return {repo: "added" | "removed" | "changed" | "unchanged"}."""
+    status = {}
+    for repo in list(new) + [r for r in old if r not in new]:
+        if repo not in new:
+            status[repo] = "removed"
+        elif repo not in old:
+            status[repo] = "added"
+        else:
+            status[repo] = "unchanged" if old[repo] == new[repo] else "changed"
+    return status
+
+
+def shard_json(data):
+    """A repo's shard: sorted metadata fields, then one commit per line."""
+    dump = lambda value: json.dumps(value, sort_keys=True, ensure_ascii=False)
+    fields = [f"  {dump(key)}: {dump(value)}" for key, value in sorted(data.items()) if key != "commits"]
+    commits = ",\n".join(f"    {dump(c)}" for c in data["commits"])
+    fields.append(f'  "commits": [\n{commits}\n  ]' if commits else '  "commits": []')
+    return "{\n" + ",\n".join(fields) + "\n}\n"
+
+
+def write_shard(repo, data, directory=SHARD_DIR):
+    """Write one repo's shard; return (index entry, whether the file changed)."""
+    body = shard_json(data).encode("utf-8")
+    name = f"{repo}.json"
+    changed = write_if_changed(os.path.join(directory, name), body)
+    entry = {"path": name, "sha256": repo_hash(data), "bytes": len(body), "commits": len(data["commits"])}
+    return entry, changed
+
+
+def write_index(shards, generated, directory=SHARD_DIR):
+    """Write the shard index and delete shards no longer listed in it."""
+    index_path = os.path.join(directory, SHARD_INDEX)
+    old_shards = (load_index(directory) or {}).get("shards", {})
+    removed = [repo for repo in old_shards if repo not in shards]
+    for repo in removed:
+        try:
+            os.unlink(os.path.join(directory, old_shards[repo]["path"]))
+        except FileNotFoundError:
+            pass
+    write_if_changed(index_path, json.dumps({"generated": generated, "shards": shards}, indent=2) + "\n")
+    return removed
+
+
+def finish_shards(shards, rewritten, generated, directory=SHARD_DIR):
+    """Write the index over shards already written and print what changed."""
+    removed = write_index(shards, generated, directory)
+    print(
+        f"Shards: {len(rewritten)} rewritten, {len(shards) - len(rewritten)} unchanged"
+        + (f", {len(removed)} removed" if removed else "")
+    )
+    return rewritten
+
+
+def write_shards(repos, generated, directory=SHARD_DIR):
+    """Write one shard per repo plus the index; return the repos rewritten."""
+    os.makedirs(directory, exist_ok=True)
+    shards = {}
+    rewritten = []
+    for repo, data in repos.items():
+        shards[repo], changed = write_shard(repo, data, directory)
+        if changed:
+            rewritten.append(repo)
+    return finish_shards(shards, rewritten, generated, directory)
+
+
+def write_derived(stats, directory=SHARD_DIR):
+    write_rollup(stats)
+    write_shards(stats["repos"], stats.get("generated"), directory)
+
+
+def update_stats(
+    fetcher,
+    full=False,
+    jobs=DEFAULT_JOBS,
+    backend="rest",
+    directory=SHARD_DIR,
+):
+    """Fetch every repo, merge with the previous shards and write all outputs.
+
+    Each repo's shard is written as soon as its fetch completes, so one slow
+    repo doesn't hold the finished ones in memory; the index (and rollup)
+    follow once every repo is in. write_if_changed leaves identical shards
+    untouched. Returns 0 when something changed and EXIT_UNCHANGED when
+    nothing did."""
+    existing = load_existing(directory)
+    previous_repos = (existing or {}).get("repos", {})
+
+    os.makedirs(directory, exist_ok=True)
+    fetched = {}
+    shards = {}
+    rewritten = []
+    lines = {}
+    for r in fetcher.iter_results(previous_repos, full=full, jobs=jobs, backend=backend, ordered=False):
+        if r.error is None:
+            fetched[r.repo] = r.data
+            lines[r.repo] = f"Fetching {r.repo}... {len(r.data['commits'])} commits ({r.mode})"
+        elif r.repo in previous_repos:
+            fetched[r.repo] = previous_repos[r.repo]
+            lines[r.repo] = f"Fetching {r.repo}... FAILED: {r.error} (kept last good data)"
+        else:
+            lines[r.repo] = f"Fetching {r.repo}... FAILED: {r.error}"
+        if r.repo in fetched:
+            shards[r.repo], changed = write_shard(r.repo, fetched[r.repo], directory)
+            if changed:
+                rewritten.append(r.repo)
+    for repo in fetcher.repos:
+        if repo in lines:
+            print(lines[repo])
+    repos = {repo: fetched[repo] for repo in fetcher.repos if repo in fetched}
+    shards = {repo: shards[repo] for repo in repos}
+
+    client, cache = fetcher.client, fetcher.cache
+    print(f"{client.requests} requests, {client.bytes_received / 1024:.1f} KB received")
+    print(fetcher.scheduler.summary())
+    if cache is not None:
+        print(
+            f"cache: {cache.hits} revalidated (304), {cache.misses} fetched, "
+            f"{cache.total_bytes / 1024:.1f} KB on disk"
+        )
+
+    hashes = repo_hashes(repos)
+    old_hashes = (existing or {}).get("hashes", {})
+    changes = diff_hashes(old_hashes, hashes)
+    print()
+    for repo, status in changes.items():
+        print(f"  {repo}: {status}")
+
+    if existing and all(status == "unchanged" for status in changes.values()):
+        print(f"\nNo repo stat changes detected; leaving {directory}/ untouched")
+        if not os.path.exists(ROLLUP_PATH):
+            write_rollup(existing)
+        return EXIT_UNCHANGED
+
+    output = {
+        "generated": datetime.datetime.now(datetime.timezone.utc).isoformat().replace("+00:00", "Z"),
+        "repos": repos,
+    }
+    print()
+    write_rollup(output)
+    finish_shards(shards, rewritten, output["generated"], directory)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="ignore the existing shards and refetch every repo's full history",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"repos to fetch concurrently (default {DEFAULT_JOBS})",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help=f"ETag response cache directory (default {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=DEFAULT_MAX_BYTES / (1024 * 1024),
+        help="evict least-recently-used cache entries above this size",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="disable the response cache")
+    parser.add_argument(
+        "--max-pages",
+        type=int,
+        default=MAX_PAGES,
+        help=f"history pages of {PER_PAGE} commits to walk per repo (0 = no cap)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=("rest", "graphql"),
+        default="rest",
+        help="rest: per-repo REST calls; graphql: batched queries across all repos (needs a token)",
+    )
+    parser.add_argument(
+        "--max-wait",
+        type=float,
+        default=DEFAULT_MAX_WAIT,
+        help=f"longest single rate-limit/backoff sleep in seconds (default {DEFAULT_MAX_WAIT:.0f})",
+    )
+    parser.add_argument(
+        "--derived-only",
+        action="store_true",
+        help=f"rebuild {ROLLUP_PATH} and rewrite {SHARD_DIR}/ from the existing shards and exit",
+    )
+    args = parser.parse_args(argv)
+
+    if args.derived_only:
+        existing = load_existing()
+        if not existing:
+            print(f"No {SHARD_DIR}/{SHARD_INDEX} to build from")
+            return 1
+        write_derived(existing)
+        return 0
+
+    token = get_token()
+    backend = args.backend
+    if backend == "graphql" and not token:
+        print("GraphQL API requires a token; falling back to REST")
+        backend = "rest"
+    cache = None
+    if not args.no_cache:
+        cache = ResponseCache(args.cache_dir, max_bytes=int(args.cache_max_mb * 1024 * 1024))
+
+    fetcher = StatsFetcher(
+        token=token,
+        cache=cache,
+        scheduler=RateLimitScheduler(max_wait=args.max_wait),
+        max_pages=args.max_pages,
+    )
+    with fetcher:
+        return update_stats(fetcher, full=args.full, jobs=args.jobs, backend=backend)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
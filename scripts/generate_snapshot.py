@@ -2,23 +2,48 @@
 """
 Generate static snapshot docs pages for the Open- series.
 Pulls Markdown from GitHub and writes pre-rendered HTML into /projects/<slug>/index.html
+All docs across CONFIG are fetched up front by a bounded thread pool over
+keep-alive connections, then rendered in their original order.
+Responses are kept in an ETag cache (.cache/raw-docs) and revalidated with
+conditional requests; missing docs are remembered for --negative-ttl seconds,
+and --offline rebuilds from the cache alone.
+Fenced code is highlighted at build time by highlight.Highlighter, which
+memoizes each block on disk.
+Pages are written through output_writer: a page whose only difference is the
+snapshot date is left untouched, so unchanged docs produce no git churn.
+With --split, each repo gets a light landing page (doc index with size and
+word counts) plus one page per doc, instead of one page inlining every doc;
+doc pages prefetch their neighbours so moving between them stays instant.
+Fetch time, per-repo page timings and cache hit rates go to a JSON build
+report (--report, default build-report.json).
 """
 from __future__ import annotations
 
+import argparse
 import datetime as dt
 import os
 import re
-import sys
-import urllib.request
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Iterable, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from http_cache import ResponseCache
+from http_client import HttpClient
+from output_writer import OutputWriter
 
 try:
     import markdown  # type: ignore
+    from markdown.extensions import Extension  # type: ignore
+    from markdown.preprocessors import Preprocessor  # type: ignore
 except Exception as exc:  # pragma: no cover
     print("Missing dependency: markdown. Install with: pip install -r scripts/requirements.txt")
     raise SystemExit(1) from exc
 
+from build_profile import BuildProfiler
+from highlight import DEFAULT_CACHE_DIR as DEFAULT_HIGHLIGHT_CACHE_DIR
+from highlight import Highlighter
+
 
 @dataclass
 class DocItem:
@@ -100,13 +125,73 @@ CONFIG: List[RepoConfig] = [
 
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 PROJECTS_DIR = os.path.join(ROOT, "projects")
-
-
-def fetch_raw(owner: str, repo: str, ref: str, path: str) -> str:
-    url = f"https://raw.githubusercontent.com/{owner}/{repo}/{ref}/{path}"
-    req = urllib.request.Request(url, headers={"User-Agent": "snapshot-generator"})
-    with urllib.request.urlopen(req, timeout=30) as resp:
-        return resp.read().decode("utf-8")
+RAW_BASE_URL = os.environ.get("RAW_GITHUB_URL", "https://raw.githubusercontent.com").rstrip("/")
+DEFAULT_JOBS = 8
+FETCH_TIMEOUT = 10.0
+DEFAULT_CACHE_DIR = os.environ.get("SNAPSHOT_CACHE_DIR", os.path.join(ROOT, ".cache", "raw-docs"))
+REPORT_PATH = os.path.join(ROOT, "build-report.json")
+# Docs that 404 are rarely added within a few hours of a rebuild.
+NEGATIVE_TTL = 6 * 3600
+INDEX_FILENAME = "index.html"
+DOC_PAGE_PREFIX = "docs-"  # --split: docs-<title slug>.html next to the landing page
+
+# (owner, repo, ref, path) -> Markdown text, or the exception that fetching raised.
+FetchResult = Union[str, Exception]
+DocKey = Tuple[str, str, str, str]
+
+
+def doc_key(cfg: RepoConfig, doc: DocItem) -> DocKey:
+    return (cfg.owner, cfg.repo, cfg.ref, doc.path)
+
+
+def fetch_raw(
+    owner: str,
+    repo: str,
+    ref: str,
+    path: str,
+    client: Optional[HttpClient] = None,
+    timeout: float = FETCH_TIMEOUT,
+    cache: Optional[ResponseCache] = None,
+    negative_ttl: float = NEGATIVE_TTL,
+    offline: bool = False,
+) -> str:
+    url = f"{RAW_BASE_URL}/{owner}/{repo}/{ref}/{path}"
+    if client is None:
+        with HttpClient(headers={"User-Agent": "snapshot-generator"}) as one_off:
+            return fetch_raw(owner, repo, ref, path, one_off, timeout, cache, negative_ttl, offline)
+    if cache is not None:
+        resp = cache.fetch(client, url, negative_ttl=negative_ttl, offline=offline, timeout=timeout)
+    else:
+        resp = client.get(url, timeout=timeout)
+    return resp.body.decode("utf-8")
+
+
+def fetch_all(
+    configs: Iterable[RepoConfig],
+    jobs: int = DEFAULT_JOBS,
+    timeout: float = FETCH_TIMEOUT,
+    cache: Optional[ResponseCache] = None,
+    negative_ttl: float = NEGATIVE_TTL,
+    offline: bool = False,
+) -> Dict[DocKey, FetchResult]:
+    """Fetch every doc of every config concurrently; failures are returned, not raised."""
+    keys = list(dict.fromkeys(doc_key(cfg, doc) for cfg in configs for doc in cfg.docs))
+
+    def fetch(key: DocKey) -> FetchResult:
+        try:
+            return fetch_raw(
+                *key, client=client, timeout=timeout, cache=cache, negative_ttl=negative_ttl, offline=offline
+            )
+        except Exception as exc:
+            return exc
+
+    with HttpClient(timeout=timeout, headers={"User-Agent": "snapshot-generator"}) as client:
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(keys) or 1))) as pool:
+            results = dict(zip(keys, pool.map(fetch, keys)))
+        print(f"Fetched {len(keys)} docs in {client.requests} requests ({client.bytes_received / 1024:.1f} KB)")
+    if cache is not None:
+        print(f"cache: {cache.hits} served from cache, {cache.misses} downloaded")
+    return results
 
 
 def slugify(text: str) -> str:
@@ -115,29 +200,92 @@ def slugify(text: str) -> str:
     return text.strip("-")
 
 
-def md_to_html(md: str) -> str:
+class _HighlightPreprocessor(Preprocessor):
+    """Swap fenced blocks for pre-highlighted HTML before block parsing."""
+
+    def __init__(self, md, highlighter: Highlighter):
+        super().__init__(md)
+        self.highlighter = highlighter
+
+    def run(self, lines: List[str]) -> List[str]:
+        text = self.highlighter.replace_fences(
+            "\n".join(lines), lambda rendered: f"\n\n{self.md.htmlStash.store(rendered)}\n\n"
+        )
+        return text.split("\n")
+
+
+class HighlightExtension(Extension):
+    def __init__(self, highlighter: Highlighter, **kwargs):
+        self.highlighter = highlighter
+        super().__init__(**kwargs)
+
+    def extendMarkdown(self, md) -> None:
+        # Stands in for the fenced_code extension, which is left out: it would
+        # only see the fences this skips (unclosed ones) and its regex searches
+        # to the end of the text from each of them.
+        md.preprocessors.register(_HighlightPreprocessor(md, self.highlighter), "build_highlight", 26)
+
+
+_highlighter: Optional[Highlighter] = None
+
+
+def get_highlighter(cache_dir: Optional[str] = DEFAULT_HIGHLIGHT_CACHE_DIR) -> Highlighter:
+    """The highlighter md_to_html uses; a different cache_dir (None = memory
+    only, for profiling) replaces it."""
+    global _highlighter
+    if _highlighter is None or _highlighter.cache_root != cache_dir:
+        _highlighter = Highlighter(cache_dir)
+    return _highlighter
+
+
+def md_to_html(md: str, highlighter: Optional[Highlighter] = None) -> str:
     return markdown.markdown(
         md,
         extensions=[
-            "fenced_code",
+            HighlightExtension(highlighter or _highlighter or get_highlighter()),
             "tables",
             "toc",
-            "codehilite",
             "sane_lists",
         ],
-        extension_configs={"codehilite": {"guess_lang": False}},
     )
 
 
-def render_doc_section(cfg: RepoConfig, doc: DocItem) -> str:
+def doc_page_name(doc: DocItem) -> str:
+    return f"{DOC_PAGE_PREFIX}{slugify(doc.title)}.html"
+
+
+@dataclass
+class DocStats:
+    size: int  # bytes of Markdown
+    words: int
+
+
+def doc_stats(raw: Optional[FetchResult]) -> Optional[DocStats]:
+    if raw is None or isinstance(raw, Exception):
+        return None
+    return DocStats(len(raw.encode("utf-8")), len(raw.split()))
+
+
+def format_stats(stats: DocStats) -> str:
+    size = f"{stats.size / 1024:.1f} KB" if stats.size >= 1024 else f"{stats.size} B"
+    return f"{size} · {stats.words:,} words"
+
+
+def render_doc_section(cfg: RepoConfig, doc: DocItem, raw: Optional[FetchResult] = None) -> str:
     source_url = f"https://github.com/{cfg.owner}/{cfg.repo}/blob/{cfg.ref}/{doc.path}"
     section_id = f"doc-{slugify(doc.title)}"
+    stats_attrs = ""
 
     try:
-        raw = fetch_raw(cfg.owner, cfg.repo, cfg.ref, doc.path)
+        if raw is None:
+            raw = fetch_raw(cfg.owner, cfg.repo, cfg.ref, doc.path)
+        if isinstance(raw, Exception):
+            raise raw
         html = md_to_html(raw)
         missing_class = ""
-        status_note = ""
+        stats = doc_stats(raw)
+        stats_attrs = f" data-bytes=\"{stats.size}\" data-words=\"{stats.words}\""
+        status_note = f"<span class=\"docs-section-stats\">{format_stats(stats)}</span>"
     except Exception as exc:
         html = (
             "<p><strong>Could not load this document.</strong></p>"
@@ -148,7 +296,7 @@ def render_doc_section(cfg: RepoConfig, doc: DocItem) -> str:
         status_note = "<span class=\"docs-status-pill\">Missing</span>"
 
     return f"""
-      <section class=\"docs-section{missing_class}\" id=\"{section_id}\">
+      <section class=\"docs-section{missing_class}\" id=\"{section_id}\"{stats_attrs}>
         <div class=\"docs-section-header\">
           <h2>{doc.title}</h2>
           <div class=\"docs-section-meta\">
@@ -163,14 +311,35 @@ def render_doc_section(cfg: RepoConfig, doc: DocItem) -> str:
     """
 
 
-def render_page(cfg: RepoConfig) -> str:
-    now = dt.datetime.utcnow().strftime("%b %d, %Y")
-    repo_url = f"https://github.com/{cfg.owner}/{cfg.repo}"
+# The snapshot date is the only non-deterministic part of a page.
+STAMP_FORMAT = "%b %d, %Y"
+STAMP_RE = r"Snapshot • ([A-Z][a-z]{2} \d{2}, \d{4})</p>"
 
-    doc_links = "".join(
-        f"<li><a href=\"#doc-{slugify(doc.title)}\">{doc.title}</a></li>" for doc in cfg.docs
-    )
-    sections = "\n".join(render_doc_section(cfg, doc) for doc in cfg.docs)
+
+def today_stamp() -> str:
+    return dt.datetime.now(dt.timezone.utc).strftime(STAMP_FORMAT)
+
+
+MERMAID_SCRIPT = "<script src=\"https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.min.js\"></script>\n    "
+
+
+def render_shell(
+    cfg: RepoConfig,
+    now: str,
+    title: str,
+    description: str,
+    heading: str,
+    nav_links: str,
+    article: str,
+    sidebar_title: str = "Sections",
+    back_link: str = "<a class=\"btn-link\" href=\"../../index.html#projects\">Back to Projects</a>",
+    prefetch: Iterable[str] = (),
+) -> str:
+    """The site chrome shared by the single page, the landing page and doc pages."""
+    repo_url = f"https://github.com/{cfg.owner}/{cfg.repo}"
+    head_links = "".join(f"\n    <link rel=\"prefetch\" href=\"{href}\" />" for href in prefetch)
+    # Mermaid is ~1 MB of script; only pages with a diagram pay for it.
+    mermaid_script = MERMAID_SCRIPT if "language-mermaid" in article else ""
 
     app_store_link = (
         f"<a class=\"btn-link\" href=\"{cfg.app_store_url}\" target=\"_blank\" rel=\"noopener\">App Store</a>"
@@ -183,8 +352,8 @@ def render_page(cfg: RepoConfig) -> str:
   <head>
     <meta charset=\"UTF-8\" />
     <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\" />
-    <title>{cfg.title} Docs - Gunnar Hostetler</title>
-    <meta name=\"description\" content=\"Snapshot documentation for {cfg.title}.\" />
+    <title>{title} - Gunnar Hostetler</title>
+    <meta name=\"description\" content=\"{description}\" />{head_links}
 
     <link rel=\"preconnect\" href=\"https://fonts.googleapis.com\" />
     <link rel=\"preconnect\" href=\"https://fonts.gstatic.com\" crossorigin />
@@ -222,33 +391,32 @@ def render_page(cfg: RepoConfig) -> str:
       <div class=\"container\">
         <div class=\"docs-hero\">
           <p class=\"docs-kicker\">Snapshot • {now}</p>
-          <h1>{cfg.title} Docs</h1>
+          <h1>{heading}</h1>
           <p>{cfg.tagline}</p>
           <div class=\"docs-actions\">
             <a class=\"btn-link\" href=\"{repo_url}\" target=\"_blank\" rel=\"noopener\">GitHub Repo</a>
             {app_store_link}
-            <a class=\"btn-link\" href=\"../../index.html#projects\">Back to Projects</a>
+            {back_link}
           </div>
         </div>
 
         <div class=\"docs-layout\">
           <aside class=\"docs-sidebar\">
-            <div class=\"docs-sidebar-title\">Sections</div>
+            <div class=\"docs-sidebar-title\">{sidebar_title}</div>
             <ul class=\"docs-nav\">
-              {doc_links}
+              {nav_links}
             </ul>
             <div class=\"docs-status\">Generated from GitHub on {now}.</div>
           </aside>
 
           <article class=\"md-content\">
-            {sections}
+            {article}
           </article>
         </div>
       </div>
     </main>
 
-    <script src=\"https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.min.js\"></script>
-    <script>
+    {mermaid_script}<script>
       const navToggle = document.querySelector('.nav-toggle');
       const navMenu = document.querySelector('.nav-menu');
       if (navToggle && navMenu) {{
@@ -279,23 +447,204 @@ def render_page(cfg: RepoConfig) -> str:
 """
 
 
-def ensure_dir(path: str) -> None:
-    os.makedirs(path, exist_ok=True)
 
 
-def write_page(cfg: RepoConfig) -> None:
-    target_dir = os.path.join(PROJECTS_DIR, cfg.slug)
-    ensure_dir(target_dir)
-    path = os.path.join(target_dir, "index.html")
-    html = render_page(cfg)
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(html)
-    print(f"Wrote {path}")
+def render_page(
+    cfg: RepoConfig,
+    fetched: Optional[Dict[DocKey, FetchResult]] = None,
+    stamp: Optional[str] = None,
+) -> str:
+    """One page inlining every doc of the repo."""
+    doc_links = "".join(
+        f"<li><a href=\"#doc-{slugify(doc.title)}\">{doc.title}</a></li>" for doc in cfg.docs
+    )
+    fetched = fetched or {}
+    sections = "\n".join(render_doc_section(cfg, doc, fetched.get(doc_key(cfg, doc))) for doc in cfg.docs)
+    return render_shell(
+        cfg,
+        stamp or today_stamp(),
+        title=f"{cfg.title} Docs",
+        description=f"Snapshot documentation for {cfg.title}.",
+        heading=f"{cfg.title} Docs",
+        nav_links=doc_links,
+        article=sections,
+    )
+
+
+def split_nav_links(cfg: RepoConfig, current: Optional[DocItem] = None) -> str:
+    links = []
+    for doc in cfg.docs:
+        active = " class=\"active\"" if doc is current else ""
+        links.append(f"<li><a href=\"{doc_page_name(doc)}\"{active}>{doc.title}</a></li>")
+    return "".join(links)
+
+
+def render_landing_page(
+    cfg: RepoConfig,
+    fetched: Optional[Dict[DocKey, FetchResult]] = None,
+    stamp: Optional[str] = None,
+) -> str:
+    """--split landing page: the doc index only, no doc bodies."""
+    fetched = fetched or {}
+    entries = []
+    for doc in cfg.docs:
+        raw = fetched.get(doc_key(cfg, doc))
+        stats = doc_stats(raw)
+        if stats is not None:
+            note = f"<span class=\"docs-section-stats\">{format_stats(stats)}</span>"
+        elif isinstance(raw, Exception):
+            note = "<span class=\"docs-status-pill\">Missing</span>"
+        else:
+            note = ""
+        entries.append(
+            f"<li><a href=\"{doc_page_name(doc)}\">{doc.title}</a> {note}"
+            f" <code>{doc.path}</code></li>"
+        )
+    article = f"""
+      <section class=\"docs-section\" id=\"doc-index\">
+        <div class=\"docs-section-header\">
+          <h2>Documents</h2>
+        </div>
+        <ul class=\"docs-index\">
+          {"".join(entries)}
+        </ul>
+      </section>
+    """
+    return render_shell(
+        cfg,
+        stamp or today_stamp(),
+        title=f"{cfg.title} Docs",
+        description=f"Snapshot documentation for {cfg.title}.",
+        heading=f"{cfg.title} Docs",
+        nav_links=split_nav_links(cfg),
+        article=article,
+        sidebar_title="Documents",
+        # Most visitors open the first doc next.
+        prefetch=[doc_page_name(cfg.docs[0])] if cfg.docs else [],
+    )
+
+
+def render_doc_page(
+    cfg: RepoConfig,
+    doc: DocItem,
+    fetched: Optional[Dict[DocKey, FetchResult]] = None,
+    stamp: Optional[str] = None,
+    index_name: str = INDEX_FILENAME,
+) -> str:
+    """--split page for a single doc; its neighbours are prefetched."""
+    fetched = fetched or {}
+    i = cfg.docs.index(doc)
+    neighbours = [cfg.docs[j] for j in (i - 1, i + 1) if 0 <= j < len(cfg.docs)]
+    return render_shell(
+        cfg,
+        stamp or today_stamp(),
+        title=f"{doc.title} · {cfg.title} Docs",
+        description=f"{doc.title} snapshot for {cfg.title}.",
+        heading=f"{cfg.title} {doc.title}",
+        nav_links=split_nav_links(cfg, doc),
+        article=render_doc_section(cfg, doc, fetched.get(doc_key(cfg, doc))),
+        sidebar_title="Documents",
+        back_link=f"<a class=\"btn-link\" href=\"{index_name}\">All {cfg.title} Docs</a>",
+        prefetch=[doc_page_name(n) for n in neighbours],
+    )
 
 
-def main() -> None:
+def page_renderers(
+    cfg: RepoConfig,
+    fetched: Optional[Dict[DocKey, FetchResult]] = None,
+    split: bool = False,
+    index_name: str = INDEX_FILENAME,
+) -> Dict[str, Callable[[str], str]]:
+    """File name -> render(stamp) for every page of cfg."""
+    if not split:
+        return {index_name: lambda stamp: render_page(cfg, fetched, stamp)}
+    renderers: Dict[str, Callable[[str], str]] = {index_name: lambda stamp: render_landing_page(cfg, fetched, stamp)}
+    for doc in cfg.docs:
+        renderers[doc_page_name(doc)] = lambda stamp, doc=doc: render_doc_page(cfg, doc, fetched, stamp, index_name)
+    return renderers
+
+
+def write_page(
+    cfg: RepoConfig,
+    fetched: Optional[Dict[DocKey, FetchResult]] = None,
+    writer: Optional[OutputWriter] = None,
+    split: bool = False,
+) -> bool:
+    """Write the page(s), keeping the old snapshot date if nothing else changed."""
+    writer = writer or OutputWriter(ROOT)
+    changed = False
+    for name, render in page_renderers(cfg, fetched, split).items():
+        path = os.path.join(PROJECTS_DIR, cfg.slug, name)
+        wrote = writer.write_stamped(path, render, today_stamp(), STAMP_RE)
+        print(f"{'Wrote' if wrote else 'Unchanged'} {path}")
+        changed = wrote or changed
+    return changed
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate snapshot docs pages from GitHub Markdown")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help=f"concurrent doc fetches (default {DEFAULT_JOBS})")
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=FETCH_TIMEOUT,
+        help=f"per-request timeout in seconds (default {FETCH_TIMEOUT:.0f})",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help="ETag cache for fetched docs (default .cache/raw-docs)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="always download every doc")
+    parser.add_argument(
+        "--negative-ttl",
+        type=float,
+        default=NEGATIVE_TTL,
+        help=f"seconds to remember a 404 before asking again (default {NEGATIVE_TTL}, 0 = never cache)",
+    )
+    parser.add_argument("--offline", action="store_true", help="render from the cache only, no network")
+    parser.add_argument(
+        "--split",
+        action="store_true",
+        help="write a landing page plus one page per doc instead of one page with every doc",
+    )
+    parser.add_argument("--report", default=REPORT_PATH, help="where to write the JSON build report")
+    args = parser.parse_args(argv)
+
+    if args.offline and args.no_cache:
+        parser.error("--offline needs the cache")
+    cache = None if args.no_cache else ResponseCache(args.cache_dir)
+    profiler = BuildProfiler()
+    started = time.perf_counter()
+    fetched = fetch_all(
+        CONFIG,
+        jobs=args.jobs,
+        timeout=args.timeout,
+        cache=cache,
+        negative_ttl=args.negative_ttl,
+        offline=args.offline,
+    )
+    fetch_s = round(time.perf_counter() - started, 6)
+    writer = OutputWriter(ROOT)
+    highlighter = get_highlighter()
     for cfg in CONFIG:
-        write_page(cfg)
+        with profiler.stage(cfg.slug, "pages") as stats:
+            hits, misses, written = highlighter.hits, highlighter.misses, writer.bytes_written
+            write_page(cfg, fetched, writer, split=args.split)
+            stats.add(
+                bytes_written=writer.bytes_written - written,
+                cache_hits=highlighter.hits - hits,
+                cache_misses=highlighter.misses - misses,
+            )
+    profiler.cache("highlight", highlighter.hits, highlighter.misses)
+    if cache is not None:
+        profiler.cache("http", cache.hits, cache.misses)
+    profiler.write_report(args.report, jobs=args.jobs, split=args.split, offline=args.offline, fetch_s=fetch_s)
+    print(highlighter.summary())
+    print(f"Pages: {writer.summary()}")
+    print(f"Report: {args.report}")
+    print(profiler.summary())
+    writer.export_github_output()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Build-time syntax highlighting for fenced code blocks, shared by the
+snapshot generators.
+Each block is rendered once to self-contained HTML (inline styles, so pages
+need no highlighter CSS or JS) and memoized on disk by a hash of
+(backend, language, code); unchanged samples cost a file read on rebuild.
+The cache keeps one directory per version (backend, style and this file) and
+drops the others, along with entries unused for output_writer.CACHE_MAX_AGE.
+Uses Pygments when it is installed and falls back to escaped <pre><code>
+otherwise, so the stdlib-only generators keep working without it.
+"""
+from __future__ import annotations
+
+import hashlib
+import html
+import os
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from output_writer import AtomicFile, prune_cache
+
+try:
+    import pygments
+    from pygments import highlight as _pygments_highlight
+    from pygments.formatters import HtmlFormatter
+    from pygments.lexers import get_lexer_by_name
+    from pygments.util import ClassNotFound
+except ImportError:  # pragma: no cover - exercised on bare CI runners
+    pygments = None
+
+# What rendered blocks depend on besides this file; part of every cache key
+# built on highlighted output.
+BACKEND = f"pygments-{pygments.__version__}" if pygments else "plain"
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_CACHE_DIR = os.environ.get("HIGHLIGHT_CACHE_DIR", os.path.join(ROOT, ".cache", "highlight"))
+STYLE = "github-dark"
+# Blocks the page renders itself client-side (see the mermaid hook in
+# generate_snapshot.render_shell) stay as plain <code class="language-x">.
+PASSTHROUGH_LANGS = {"mermaid"}
+
+# Pygments costs several microseconds per character; a block this long is
+# nearly always a missing closing fence swallowing the rest of a file, so it
+# is shown unhighlighted rather than stalling the build.
+MAX_HIGHLIGHT = 32 * 1024
+
+# ``` or ~~~ opening fence at the start of a line, optional language and
+# attributes. It is closed by a line of at least as many of the same
+# character, as in md_document.
+FENCE_OPEN_RE = re.compile(r"(`{3,}|~{3,})[ \t]*([\w+#.-]*)")
+
+
+def _closing_fence(line: str) -> Tuple[str, int]:
+    """(character, length) if line could close a fence, else ("", 0)."""
+    stripped = line.strip()
+    if len(stripped) >= 3 and stripped[0] in "`~" and stripped == stripped[0] * len(stripped):
+        return stripped[0], len(stripped)
+    return "", 0
+
+
+def cache_version(style: str = STYLE) -> str:
+    """Hash of what a cached block depends on beyond its (language, code) key."""
+    h = hashlib.sha256(f"{BACKEND}\0{style}\0".encode("utf-8"))
+    with open(os.path.abspath(__file__), "rb") as f:
+        h.update(f.read())
+    return h.hexdigest()
+
+
+def _plain_block(code: str, lang: str) -> str:
+    cls = f' class="language-{html.escape(lang)}"' if lang else ""
+    return f"<pre><code{cls}>{html.escape(code)}</code></pre>"
+
+
+class Highlighter:
+    """Memoizing (language, code) -> HTML renderer with an on-disk cache.
+
+    Safe to share between threads; separate processes share the directory,
+    since entries are written atomically and never change once written."""
+
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_CACHE_DIR, style: str = STYLE):
+        self.cache_root = cache_dir
+        self.cache_dir = None
+        self.style = style
+        self.hits = 0
+        self.misses = 0
+        self._memory: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.backend = f"{BACKEND}-{style}" if pygments else BACKEND
+        self._formatter = (
+            HtmlFormatter(noclasses=True, nobackground=True, style=style, cssclass="codehilite")
+            if pygments
+            else None
+        )
+        if cache_dir:
+            self.cache_dir = os.path.join(cache_dir, cache_version(style)[:16])
+            os.makedirs(self.cache_dir, exist_ok=True)
+            prune_cache(cache_dir, keep=os.path.basename(self.cache_dir))
+
+    def _key(self, lang: str, code: str) -> str:
+        h = hashlib.sha256()
+        for part in (self.backend, lang, code):
+            h.update(part.encode("utf-8") + b"\0")
+        return h.hexdigest()[:40]
+
+    def _render(self, code: str, lang: str) -> str:
+        if self._formatter is None or not lang or lang in PASSTHROUGH_LANGS or len(code) > MAX_HIGHLIGHT:
+            return _plain_block(code, lang)
+        try:
+            lexer = get_lexer_by_name(lang, stripnl=False)
+        except ClassNotFound:
+            return _plain_block(code, lang)
+        return _pygments_highlight(code, lexer, self._formatter)
+
+    def block(self, code: str, lang: str = "") -> str:
+        """Return highlighted HTML for one code block."""
+        lang = lang.lower()
+        key = self._key(lang, code)
+        with self._lock:
+            cached = self._memory.get(key)
+        if cached is None and self.cache_dir:
+            path = os.path.join(self.cache_dir, key + ".html")
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    cached = f.read()
+                os.utime(path)
+            except OSError:
+                pass
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+                self._memory[key] = cached
+            return cached
+
+        rendered = self._render(code, lang)
+        with self._lock:
+            self.misses += 1
+            self._memory[key] = rendered
+        if self.cache_dir:
+            with AtomicFile(os.path.join(self.cache_dir, key + ".html"), "w", encoding="utf-8") as out:
+                out.file.write(rendered)
+        return rendered
+
+    def replace_fences(self, text: str, store: Callable[[str], str]) -> str:
+        """Replace each fenced block in Markdown text with store(highlighted_html).
+
+        store decides what stands in for the block (a Markdown htmlStash
+        placeholder, or the HTML itself). An opening fence with no closer is
+        left as text. One pass over the lines: the longest closing fence of
+        each kind still ahead is known up front, so an unclosed opener is not
+        searched for to the end of the file."""
+        lines = text.split("\n")
+        closers = [_closing_fence(line) for line in lines]
+        ahead: Dict[str, List[int]] = {"`": [0] * (len(lines) + 1), "~": [0] * (len(lines) + 1)}
+        for i in range(len(lines) - 1, -1, -1):
+            for char, longest in ahead.items():
+                longest[i] = longest[i + 1]
+            char, size = closers[i]
+            if char and size > ahead[char][i]:
+                ahead[char][i] = size
+
+        out = []
+        i = 0
+        while i < len(lines):
+            m = FENCE_OPEN_RE.match(lines[i])
+            if m is None or ahead[m.group(1)[0]][i + 1] < len(m.group(1)):
+                out.append(lines[i])
+                i += 1
+                continue
+            char, size = m.group(1)[0], len(m.group(1))
+            end = i + 1
+            while closers[end][0] != char or closers[end][1] < size:
+                end += 1
+            code = "".join(line + "\n" for line in lines[i + 1 : end])
+            out.append(store(self.block(code, m.group(2))))
+            i = end + 1
+        return "\n".join(out)
+
+    def summary(self) -> str:
+        return f"highlight: {self.hits} cached, {self.misses} rendered ({self.backend})"
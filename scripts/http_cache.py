@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk HTTP response cache with conditional revalidation.
+Entries are keyed by URL and store the body plus its ETag / Last-Modified
+validators. Revalidation sends If-None-Match / If-Modified-Since; a 304 serves
+the cached body (and, on GitHub, does not count against the rate limit).
+The cache is capped in bytes and evicts least-recently-used entries.
+Optionally 404s are cached for a TTL, and offline mode serves whatever is
+stored without touching the network.
+Pure Python stdlib.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from http_client import HTTPError, HttpClient, Response
+from output_writer import AtomicFile
+
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+# Response headers worth keeping with a cached body.
+_KEPT_HEADERS = ("content-type", "etag", "last-modified", "link")
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    with AtomicFile(path) as out:
+        out.file.write(data)
+
+
+class CacheMiss(LookupError):
+    """Offline mode and nothing stored for the URL."""
+
+
+class ResponseCache:
+    """URL-keyed body + validator store under `directory`, capped at max_bytes."""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        # key -> (size, last_used); rebuilt from disk so the cap holds across runs.
+        self._entries: Dict[str, list] = {}
+        for name in os.listdir(directory):
+            if name.endswith(".json"):
+                key = name[:-5]
+                body_path = self._path(key, ".body")
+                try:
+                    meta_stat = os.stat(self._path(key, ".json"))
+                    size = meta_stat.st_size + os.path.getsize(body_path)
+                except OSError:
+                    self._remove(key)
+                    continue
+                self._entries[key] = [size, meta_stat.st_mtime]
+        self._total = sum(size for size, _ in self._entries.values())
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()[:40]
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, key + suffix)
+
+    def _remove(self, key: str) -> None:
+        for suffix in (".json", ".body"):
+            try:
+                os.unlink(self._path(key, suffix))
+            except FileNotFoundError:
+                pass
+
+    def get(self, url: str) -> Optional[Response]:
+        """Return the stored response for url, or None."""
+        entry = self._load(url)
+        return entry[0] if entry else None
+
+    def _load(self, url: str):
+        """Return (response, stored_at) for url, or None."""
+        key = self.key_for(url)
+        try:
+            with open(self._path(key, ".json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(self._path(key, ".body"), "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:
+            return None
+        return Response(url=url, status=meta["status"], headers=meta["headers"], body=body), meta.get("stored", 0)
+
+    def put(self, response: Response) -> None:
+        headers = {k: v for k, v in response.headers.items() if k in _KEPT_HEADERS}
+        meta = json.dumps(
+            {"url": response.url, "status": response.status, "headers": headers, "stored": time.time()}
+        ).encode("utf-8")
+        key = self.key_for(response.url)
+        with self._lock:
+            _atomic_write(self._path(key, ".body"), response.body)
+            _atomic_write(self._path(key, ".json"), meta)
+            old = self._entries.get(key)
+            if old:
+                self._total -= old[0]
+            size = len(meta) + len(response.body)
+            self._entries[key] = [size, time.time()]
+            self._total += size
+            self._evict(keep=key)
+
+    def touch(self, url: str) -> None:
+        key = self.key_for(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                entry[1] = time.time()
+                try:
+                    os.utime(self._path(key, ".json"))
+                except OSError:
+                    pass
+
+    def _evict(self, keep: str) -> None:
+        if self._total <= self.max_bytes:
+            return
+        for key, (size, _) in sorted(self._entries.items(), key=lambda kv: kv[1][1]):
+            if self._total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self._remove(key)
+            del self._entries[key]
+            self._total -= size
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total
+
+    def fetch(
+        self,
+        client: HttpClient,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        negative_ttl: float = 0,
+        offline: bool = False,
+        timeout: Optional[float] = None,
+    ) -> Response:
+        """GET url through the cache, revalidating any stored copy.
+
+        Raises HTTPError for 4xx/5xx. A 304 returns the cached body with
+        from_cache=True and the fresh response's headers layered on top.
+        With negative_ttl, a 404 is stored and replayed (as HTTPError) for
+        that many seconds without a request. offline serves the stored copy
+        as-is and raises CacheMiss when there is none."""
+        entry = self._load(url)
+        cached, stored_at = entry if entry else (None, 0)
+        if cached is not None and cached.status == 404:
+            if offline or time.time() - stored_at < negative_ttl:
+                with self._lock:
+                    self.hits += 1
+                raise HTTPError(cached)
+            cached = None
+        if offline:
+            if cached is None:
+                raise CacheMiss(url)
+            with self._lock:
+                self.hits += 1
+            cached.from_cache = True
+            return cached
+
+        request_headers = dict(headers or {})
+        if cached is not None:
+            if cached.header("etag"):
+                request_headers["If-None-Match"] = cached.header("etag")
+            if cached.header("last-modified"):
+                request_headers["If-Modified-Since"] = cached.header("last-modified")
+
+        resp = client.request(url, headers=request_headers, timeout=timeout)
+        if resp.status == 304 and cached is not None:
+            with self._lock:
+                self.hits += 1
+            self.touch(url)
+            return Response(
+                url=url,
+                status=cached.status,
+                headers={**cached.headers, **{k: v for k, v in resp.headers.items() if k != "content-length"}},
+                body=cached.body,
+                from_cache=True,
+            )
+        if resp.status == 404 and negative_ttl > 0:
+            self.put(resp)
+        if resp.status >= 400:
+            raise HTTPError(resp)
+        with self._lock:
+            self.misses += 1
+        if resp.status == 200 and (resp.header("etag") or resp.header("last-modified")):
+            self.put(resp)
+        return resp
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Small keep-alive HTTP client shared by the build scripts.
+Each worker thread keeps one persistent connection per host, so repeated calls
+to api.github.com / raw.githubusercontent.com skip the TCP + TLS handshake.
+Pure Python stdlib.
+"""
+from __future__ import annotations
+
+import http.client
+import threading
+import urllib.parse
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+DEFAULT_TIMEOUT = 30
+
+# Errors that mean a pooled connection went stale between requests.
+_STALE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+@dataclass
+class Response:
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes = field(repr=False)
+    from_cache: bool = False
+
+    def header(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self.headers.get(name.lower(), default)
+
+
+class HTTPError(Exception):
+    def __init__(self, response: Response):
+        super().__init__(f"HTTP {response.status} for {response.url}")
+        self.response = response
+        self.status = response.status
+
+
+class HttpClient:
+    """Thread-safe client with one persistent connection per (thread, host)."""
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, headers: Optional[Dict[str, str]] = None):
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.requests = 0
+        self.bytes_received = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all: List[http.client.HTTPConnection] = []
+
+    def _connection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        pool = getattr(self._local, "pool", None)
+        if pool is None:
+            pool = self._local.pool = {}
+        conn = pool.get((scheme, netloc))
+        if conn is None:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = cls(netloc, timeout=self.timeout)
+            pool[(scheme, netloc)] = conn
+            with self._lock:
+                self._all.append(conn)
+        return conn
+
+    def _drop(self, scheme: str, netloc: str) -> None:
+        conn = self._local.pool.pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+            with self._lock:
+                if conn in self._all:
+                    self._all.remove(conn)
+
+    def request(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        method: str = "GET",
+        body: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+    ) -> Response:
+        """Send a request and return the full Response (any status code)."""
+        parts = urllib.parse.urlsplit(url)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        merged = {**self.headers, **(headers or {})}
+
+        for attempt in range(2):
+            conn = self._connection(parts.scheme, parts.netloc)
+            conn.timeout = timeout or self.timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(conn.timeout)
+            try:
+                conn.request(method, target, body=body, headers=merged)
+                raw = conn.getresponse()
+                data = raw.read()
+            except _STALE_ERRORS:
+                self._drop(parts.scheme, parts.netloc)
+                if attempt or body is not None:
+                    raise
+                continue
+            except Exception:
+                self._drop(parts.scheme, parts.netloc)
+                raise
+            if raw.will_close:
+                self._drop(parts.scheme, parts.netloc)
+            with self._lock:
+                self.requests += 1
+                self.bytes_received += len(data)
+            return Response(
+                url=url,
+                status=raw.status,
+                headers={k.lower(): v for k, v in raw.getheaders()},
+                body=data,
+            )
+        raise RuntimeError("unreachable")
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> Response:
+        """GET url, raising HTTPError for 4xx/5xx responses."""
+        resp = self.request(url, headers=headers, timeout=timeout)
+        if resp.status >= 400:
+            raise HTTPError(resp)
+        return resp
+
+    def close(self) -> None:
+        with self._lock:
+            conns, self._all = self._all, []
+        for conn in conns:
+            conn.close()
+
+    def __enter__(self) -> "HttpClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
@@ -0,0 +1,731 @@
+#!/usr/bin/env python3
+"""
+Parse-once Markdown document model shared by the snapshot generators.
+parse() makes one line-by-line pass over a file and builds a flat list of
+blocks (headings, paragraphs, lists, fenced code, quotes, tables, HTML) plus
+an index of heading offsets. Indented blocks under a list item (fences,
+further paragraphs) are parsed into that item's own Document. Inline markup is tokenized on demand, once per
+block, by a left-to-right scanner with a delimiter stack, so unclosed
+emphasis or stray backticks cost linear time. Feature extraction, tech
+scanning (plain_text), the table of contents and HTML rendering all read
+from the same tree, and code spans and fences are never touched by the
+inline rules. Raw HTML (blocks and inline tags) is reduced to an allow-list
+of tags and attributes on output; other tags are escaped and URLs with
+schemes other than http(s)/mailto are dropped.
+Pure Python stdlib.
+"""
+from __future__ import annotations
+
+import html
+import re
+from collections import namedtuple
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+Block = namedtuple("Block", "kind offset level lang text items children", defaults=(0, "", "", (), None))
+ListItem = namedtuple("ListItem", "indent ordered text children", defaults=(None,))
+Heading = namedtuple("Heading", "level text slug offset block")
+
+FENCE_OPEN_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})[ \t]*([\w+#.-]*)")
+HEADING_RE = re.compile(r"^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$")
+SETEXT_RE = re.compile(r"^ {0,3}(=+|-+)[ \t]*$")
+RULE_RE = re.compile(r"^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$")
+LIST_ITEM_RE = re.compile(r"^([ \t]*)([-*+]|\d{1,9}[.)])(?:[ \t]+(.*))?$")
+QUOTE_RE = re.compile(r"^ {0,3}> ?(.*)$")
+TABLE_SEP_RE = re.compile(r"^[ \t]*\|?(?:[ \t]*:?-+:?[ \t]*\|)*[ \t]*:?-+:?[ \t]*\|?[ \t]*$")
+HTML_BLOCK_RE = re.compile(r"^ {0,3}<(?:/?[A-Za-z][\w-]*[\s/>]|/?[A-Za-z][\w-]*$|!--)")
+CELL_SPLIT_RE = re.compile(r"(?<!\\)\|")
+FEATURES_RE = re.compile(r"(?:core\s+)?features?", re.IGNORECASE)
+
+INLINE_SPECIAL_RE = re.compile(r"[\\`*_\[\]!<\n]")
+PAREN_RE = re.compile(r"\\.|[()\n]")
+AUTOLINK_RE = re.compile(r"<((?:https?|mailto):[^\s<>]+)>")
+INLINE_HTML_RE = re.compile(r"</?[A-Za-z][\w-]*(?:\s+[\w:-]+(?:\s*=\s*(?:\"[^\"]*\"|'[^']*'|[^\s\"'=<>`]+))?)*\s*/?>")
+TAG_RE = re.compile(r"<[^>]*>")
+RAW_HTML_RE = re.compile(r"<!--.*?-->|<(/?)([A-Za-z][\w-]*)((?:[^>\"']|\"[^\"]*\"|'[^']*')*)>|<", re.DOTALL)
+ATTR_RE = re.compile(r"([^\s\"'>/=]+)(?:\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s\"'=<>`]+)))?")
+SAFE_URL_RE = re.compile(r"^(?:https?:|mailto:|/|#)", re.IGNORECASE)
+SCHEME_RE = re.compile(r"^[a-z][a-z0-9+.-]*:", re.IGNORECASE)
+# Browsers ignore these inside a URL, so "java\tscript:" is still javascript:.
+URL_IGNORED_RE = re.compile(r"[\x00-\x20\x7f]")
+# What READMEs use for layout (centred logos, badges, collapsible sections).
+ALLOWED_TAGS = set(
+    "a abbr b blockquote br center code dd del details div dl dt em h1 h2 h3 h4 h5 h6 hr i img ins kbd li "
+    "ol p picture pre s samp small source span strong sub summary sup table tbody td tfoot th thead tr u ul".split()
+)
+ALLOWED_ATTRS = {"align", "alt", "colspan", "height", "open", "rowspan", "title", "width"}
+URL_ATTRS = {"a": "href", "img": "src"}
+SLUG_DROP_RE = re.compile(r"[^\w\- ]")
+MAX_URL = 2048
+BLOCK_MARKERS = set("`~#>-*_+=0123456789")
+ESCAPABLE = set("\\`*_{}[]()#+-.!|<>~\"'")
+
+Token = Union[tuple, list]
+
+
+# -- inline ------------------------------------------------------------------
+
+
+def _paren_pairs(text: str) -> Dict[int, int]:
+    """{offset of "(": offset of its matching ")"}, pairing within each line
+    and skipping backslash escapes. One pass, so every link's closing paren
+    is a lookup however many "](" the text holds."""
+    pairs: Dict[int, int] = {}
+    opens: List[int] = []
+    for m in PAREN_RE.finditer(text):
+        c = m.group()
+        if c == "(":
+            opens.append(m.start())
+        elif c == ")":
+            if opens:
+                pairs[opens.pop()] = m.start()
+        elif c == "\n":
+            opens.clear()
+    return pairs
+
+
+class _Opener:
+    __slots__ = ("kind", "index", "count", "pos")
+
+    def __init__(self, kind, index, count=0, pos=0):
+        self.kind = kind  # "*", "_", "[" or "!["
+        self.index = index  # position of its placeholder token in out
+        self.count = count  # delimiter characters not yet matched
+        self.pos = pos  # source offset just after "[" (for image alt text)
+
+
+def parse_inline(text: str) -> List[Token]:
+    """Tokenize inline Markdown.
+
+    Tokens are ("text", s), ("code", s), ("raw", html), ("open", tag, href),
+    ("close", tag), ("img", src, alt) and ["delim", char, count, tags] for an
+    emphasis run: count unmatched characters stay literal, tags (innermost
+    first) are the elements it opened."""
+    out: List[Token] = []
+    stack: List[_Opener] = []
+    # Lowest stack index worth searching for each delimiter; a failed search
+    # raises it so runs of unmatched closers stay linear.
+    bottom = {"*": 0, "_": 0}
+    ticks: Dict[int, int] = {}  # run length -> next occurrence (memoized find)
+    pairs: Optional[Dict[int, int]] = None  # built on the first "]("
+    brackets = 0  # "[" / "![" openers on the stack
+    pos, n = 0, len(text)
+
+    def lower_bottoms(size):
+        for c in bottom:
+            if bottom[c] > size:
+                bottom[c] = size
+
+    while pos < n:
+        m = INLINE_SPECIAL_RE.search(text, pos)
+        if m is None:
+            out.append(("text", text[pos:]))
+            break
+        i = m.start()
+        if i > pos:
+            out.append(("text", text[pos:i]))
+        c = text[i]
+
+        if c == "\\":
+            if i + 1 < n and text[i + 1] in ESCAPABLE:
+                out.append(("text", text[i + 1]))
+                pos = i + 2
+            else:
+                out.append(("text", "\\"))
+                pos = i + 1
+
+        elif c == "`":
+            j = i
+            while j < n and text[j] == "`":
+                j += 1
+            run = text[i:j]
+            close = ticks.get(len(run), -2)
+            if close != -1 and close < j:
+                close = text.find(run, j)
+                ticks[len(run)] = close
+            if close == -1:
+                out.append(("text", run))
+                pos = j
+            else:
+                code = text[j:close].replace("\n", " ")
+                if len(code) > 2 and code[0] == " " and code[-1] == " ":
+                    code = code[1:-1]
+                out.append(("code", code))
+                pos = close + len(run)
+
+        elif c in "*_":
+            j = i
+            while j < n and text[j] == c:
+                j += 1
+            before = text[i - 1] if i else " "
+            after = text[j] if j < n else " "
+            can_open = not after.isspace()
+            can_close = not before.isspace()
+            if c == "_":
+                can_open = can_open and not before.isalnum()
+                can_close = can_close and not after.isalnum()
+            remaining = j - i
+            while can_close and remaining:
+                k = len(stack) - 1
+                while k >= bottom[c] and stack[k].kind not in (c, "[", "!["):
+                    k -= 1
+                if k < bottom[c] or stack[k].kind != c:
+                    bottom[c] = len(stack)
+                    break
+                opener = stack[k]
+                use = 2 if remaining >= 2 and opener.count >= 2 else 1
+                tag = "strong" if use == 2 else "em"
+                out[opener.index][2] -= use
+                out[opener.index][3].append(tag)
+                out.append(("close", tag))
+                opener.count -= use
+                remaining -= use
+                # Unmatched openers between the pair can no longer close.
+                del stack[k + 1 :]
+                if opener.count == 0:
+                    stack.pop()
+                lower_bottoms(len(stack))
+            if remaining:
+                if can_open:
+                    stack.append(_Opener(c, len(out), remaining))
+                    out.append(["delim", c, remaining, []])
+                else:
+                    out.append(("text", c * remaining))
+            pos = j
+
+        elif c == "!":
+            if i + 1 < n and text[i + 1] == "[":
+                stack.append(_Opener("![", len(out), pos=i + 2))
+                brackets += 1
+                out.append(("text", "!["))
+                pos = i + 2
+            else:
+                out.append(("text", "!"))
+                pos = i + 1
+
+        elif c == "[":
+            stack.append(_Opener("[", len(out), pos=i + 1))
+            brackets += 1
+            out.append(("text", "["))
+            pos = i + 1
+
+        elif c == "]":
+            if not brackets:
+                out.append(("text", "]"))
+                pos = i + 1
+                continue
+            k = len(stack) - 1
+            while stack[k].kind not in ("[", "!["):
+                k -= 1
+            opener = stack[k]
+            url = None
+            close = -1
+            if i + 1 < n and text[i + 1] == "(":
+                # Parentheses in the URL must balance: (Foo_(bar)) keeps both.
+                if pairs is None:
+                    pairs = _paren_pairs(text)
+                close = pairs.get(i + 1, -1)
+                if close != -1 and close - i <= MAX_URL:
+                    target = text[i + 2 : close]
+                    if target.strip():
+                        url = target.split()[0].strip("<>")
+            # Emphasis openers inside the brackets are dropped with it.
+            del stack[k:]
+            brackets -= 1
+            lower_bottoms(k)
+            if url is None:
+                out.append(("text", "]"))
+                pos = i + 1
+            elif opener.kind == "![":
+                alt = plain_text(parse_inline(text[opener.pos : i]))
+                del out[opener.index :]
+                out.append(("img", url, alt))
+                pos = close + 1
+            else:
+                out[opener.index] = ("open", "a", url)
+                out.append(("close", "a"))
+                pos = close + 1
+
+        elif c == "<":
+            m = AUTOLINK_RE.match(text, i) or INLINE_HTML_RE.match(text, i)
+            if m is None:
+                out.append(("text", "<"))
+                pos = i + 1
+            elif m.re is AUTOLINK_RE:
+                out += [("open", "a", m.group(1)), ("text", m.group(1)), ("close", "a")]
+                pos = m.end()
+            else:
+                out.append(("raw", m.group(0)))
+                pos = m.end()
+
+        else:  # newline
+            out.append(("text", "\n"))
+            pos = i + 1
+    return out
+
+
+def unsafe_url(url: str) -> bool:
+    """True for a URL with a scheme other than http(s) or mailto."""
+    probe = URL_IGNORED_RE.sub("", html.unescape(url))
+    return bool(SCHEME_RE.match(probe)) and not SAFE_URL_RE.match(probe)
+
+
+def _href(url: str, link: Optional[Callable[[str], str]]) -> str:
+    url = link(url) if link else url
+    return "#" if unsafe_url(url) else url
+
+
+def sanitize_html(text: str, link: Optional[Callable[[str], str]] = None) -> str:
+    """Raw HTML reduced to ALLOWED_TAGS and ALLOWED_ATTRS: other tags are
+    escaped (so <script> shows as text), comments dropped, and href/src go
+    through link and the scheme check."""
+
+    def clean(m):
+        whole = m.group(0)
+        if whole == "<":
+            return "&lt;"
+        if whole.startswith("<!--"):
+            return ""
+        closing, tag = m.group(1), m.group(2).lower()
+        if tag not in ALLOWED_TAGS:
+            return html.escape(whole)
+        if closing:
+            return f"</{tag}>"
+        attrs = []
+        for a in ATTR_RE.finditer(m.group(3)):
+            name = a.group(1).lower()
+            value = next((v for v in a.group(2, 3, 4) if v is not None), "")
+            if name == URL_ATTRS.get(tag):
+                attrs.append(f' {name}="{html.escape(_href(html.unescape(value), link))}"')
+            elif name in ALLOWED_ATTRS:
+                attrs.append(f' {name}="{html.escape(html.unescape(value))}"')
+        return f"<{tag}{''.join(attrs)}>"
+
+    return RAW_HTML_RE.sub(clean, text)
+
+
+def inline_html(tokens: Iterable[Token], link: Optional[Callable[[str], str]] = None) -> str:
+    """HTML for inline tokens; link, if given, rewrites each href/src."""
+    parts = []
+    for t in tokens:
+        kind = t[0]
+        if kind == "text":
+            parts.append(html.escape(t[1]))
+        elif kind == "delim":
+            parts.append(t[1] * t[2] + "".join(f"<{tag}>" for tag in reversed(t[3])))
+        elif kind == "code":
+            parts.append(f"<code>{html.escape(t[1])}</code>")
+        elif kind == "open":
+            if t[1] == "a":
+                parts.append(f'<a href="{html.escape(_href(t[2], link))}">')
+            else:
+                parts.append(f"<{t[1]}>")
+        elif kind == "close":
+            parts.append(f"</{t[1]}>")
+        elif kind == "img":
+            parts.append(f'<img src="{html.escape(_href(t[1], link))}" alt="{html.escape(t[2])}">')
+        else:  # raw
+            parts.append(sanitize_html(t[1], link))
+    return "".join(parts)
+
+
+def plain_text(tokens: Iterable[Token]) -> str:
+    parts = []
+    for t in tokens:
+        kind = t[0]
+        if kind in ("text", "code"):
+            parts.append(t[1])
+        elif kind == "delim":
+            parts.append(t[1] * t[2])
+        elif kind == "img":
+            parts.append(t[2])
+    return "".join(parts)
+
+
+# -- blocks ------------------------------------------------------------------
+
+
+def slugify(text: str) -> str:
+    """GitHub-style anchor: lower case, punctuation dropped, spaces to '-'."""
+    return SLUG_DROP_RE.sub("", text.strip().lower()).replace(" ", "-")
+
+
+class Document:
+    """A parsed Markdown file: blocks in order plus a heading index."""
+
+    def __init__(self, source: str, blocks: List[Block]):
+        self.source = source
+        self.blocks = blocks
+        self._inline: Dict[str, List[Token]] = {}
+        self._plain: Optional[str] = None
+        self.headings: List[Heading] = []
+        seen: Dict[str, int] = {}
+        for index, block in enumerate(blocks):
+            if block.kind == "heading":
+                text = plain_text(self.inline(block.text))
+                slug = slugify(text) or "section"
+                if slug in seen:
+                    seen[slug] += 1
+                    slug = f"{slug}-{seen[slug]}"
+                else:
+                    seen[slug] = 0
+                self.headings.append(Heading(block.level, text, slug, block.offset, index))
+
+    def inline(self, text: str) -> List[Token]:
+        """Inline tokens for a block's text, parsed at most once."""
+        tokens = self._inline.get(text)
+        if tokens is None:
+            tokens = self._inline[text] = parse_inline(text)
+        return tokens
+
+    def section(self, title, min_level: int = 1) -> List[Block]:
+        """Blocks under the first heading whose text matches title (a
+        compiled regex, matched in full) up to the next heading of the same
+        or a higher level."""
+        for i, h in enumerate(self.headings):
+            if h.level >= min_level and title.fullmatch(h.text.strip()):
+                end = len(self.blocks)
+                for later in self.headings[i + 1 :]:
+                    if later.level <= h.level:
+                        end = later.block
+                        break
+                return self.blocks[h.block + 1 : end]
+        return []
+
+    def toc(self, min_level: int = 2, max_level: int = 3) -> List[Heading]:
+        return [h for h in self.headings if min_level <= h.level <= max_level]
+
+    def toc_html(self, min_level: int = 2, max_level: int = 3) -> str:
+        items = "".join(
+            f'<li class="toc-h{h.level}"><a href="#{h.slug}">{html.escape(h.text)}</a></li>'
+            for h in self.toc(min_level, max_level)
+        )
+        return f'<nav class="toc"><ul>{items}</ul></nav>' if items else ""
+
+    def plain_text(self) -> str:
+        """The document's text without markup (link targets dropped), for
+        keyword scanning. Code blocks are kept, inside ``` fences so a
+        scanner can tell them from prose."""
+        if self._plain is None:
+            parts = []
+            for block in self.blocks:
+                if block.kind in ("heading", "paragraph"):
+                    parts.append(plain_text(self.inline(block.text)))
+                elif block.kind == "list":
+                    for item in block.items:
+                        parts.append(plain_text(self.inline(item.text)))
+                        if item.children is not None:
+                            parts.append(item.children.plain_text())
+                elif block.kind == "table":
+                    parts.extend(plain_text(self.inline(cell)) for row in block.items for cell in row)
+                elif block.kind == "code":
+                    parts.append(f"````\n{block.text}\n````")
+                elif block.kind == "html":
+                    parts.append(TAG_RE.sub(" ", block.text))
+                elif block.kind == "quote":
+                    parts.append(block.children.plain_text())
+            self._plain = "\n".join(parts)
+        return self._plain
+
+    def to_html(self, highlighter=None, link: Optional[Callable[[str], str]] = None) -> str:
+        """Render to HTML; fenced code goes through highlighter.block()
+        when one is given, else plain <pre><code>. link rewrites URLs."""
+        slugs = {h.block: h.slug for h in self.headings}
+        out = []
+        for index, block in enumerate(self.blocks):
+            kind = block.kind
+            if kind == "heading":
+                body = inline_html(self.inline(block.text), link)
+                out.append(f'<h{block.level} id="{slugs[index]}">{body}</h{block.level}>')
+            elif kind == "paragraph":
+                out.append(f"<p>{inline_html(self.inline(block.text), link)}</p>")
+            elif kind == "code":
+                if highlighter is not None:
+                    out.append(highlighter.block(block.text, block.lang))
+                else:
+                    cls = f' class="language-{html.escape(block.lang)}"' if block.lang else ""
+                    out.append(f"<pre><code{cls}>{html.escape(block.text)}</code></pre>")
+            elif kind == "list":
+                out.append(self._list_html(block.items, highlighter, link))
+            elif kind == "quote":
+                out.append(f"<blockquote>{block.children.to_html(highlighter, link)}</blockquote>")
+            elif kind == "table":
+                out.append(self._table_html(block.items, link))
+            elif kind == "rule":
+                out.append("<hr>")
+            else:  # html
+                out.append(sanitize_html(block.text, link))
+        return "\n".join(out)
+
+    def _list_html(self, items: List[ListItem], highlighter=None, link=None) -> str:
+        out = []
+        stack = []  # (indent, tag) of each open list
+        for item in items:
+            tag = "ol" if item.ordered else "ul"
+            while stack and item.indent < stack[-1][0]:
+                out.append(f"</li></{stack.pop()[1]}>")
+            if stack and item.indent == stack[-1][0]:
+                if stack[-1][1] == tag:
+                    out.append("</li>")
+                else:
+                    out.append(f"</li></{stack.pop()[1]}>")
+            if not stack or item.indent > stack[-1][0]:
+                out.append(f"<{tag}>")
+                stack.append((item.indent, tag))
+            out.append(f"<li>{inline_html(self.inline(item.text), link)}")
+            if item.children is not None:
+                out.append(item.children.to_html(highlighter, link))
+        while stack:
+            out.append(f"</li></{stack.pop()[1]}>")
+        return "".join(out)
+
+    def _table_html(self, rows: List[List[str]], link=None) -> str:
+        head, body = rows[0], rows[1:]
+        out = ["<table><thead><tr>"]
+        out += [f"<th>{inline_html(self.inline(cell), link)}</th>" for cell in head]
+        out.append("</tr></thead><tbody>")
+        for row in body:
+            out.append("<tr>" + "".join(f"<td>{inline_html(self.inline(cell), link)}</td>" for cell in row) + "</tr>")
+        out.append("</tbody></table>")
+        return "".join(out)
+
+    def features(self, limit: int = 8) -> List[Dict[str, str]]:
+        """Top-level bullets of the "Features"/"Core Features" section.
+
+        "**Name**: description" bullets become {name, description}; other
+        bullets longer than 10 characters become a name-only feature."""
+        features = []
+        for block in self.section(FEATURES_RE, min_level=2):
+            if block.kind != "list":
+                continue
+            for item in block.items:
+                if item.indent:
+                    continue
+                tokens = self.inline(item.text)
+                first = tokens[0] if tokens else None
+                if first and first[0] == "delim" and first[2] == 0 and first[3] == ["strong"]:
+                    depth = 0
+                    for split, t in enumerate(tokens):
+                        if t[0] == "delim":
+                            depth += len(t[3])
+                        elif t[0] == "close" and t[1] in ("strong", "em"):
+                            depth -= 1
+                            if depth == 0:
+                                break
+                    name = plain_text(tokens[1:split]).strip()
+                    description = plain_text(tokens[split + 1 :]).lstrip(": \t").strip()
+                    features.append({"name": name, "description": description})
+                else:
+                    text = plain_text(tokens).strip()
+                    if len(text) > 10:
+                        features.append({"name": text[:50], "description": ""})
+        return features[:limit]
+
+
+def _closes_fence(line: str, marker: str) -> bool:
+    stripped = line.strip()
+    return bool(stripped) and stripped[0] == marker[0] and stripped == stripped[0] * len(stripped) and len(stripped) >= len(marker)
+
+
+def _opens_fence(line: str):
+    """FENCE_OPEN_RE match for line, or None (a ``` info string can't hold a backtick)."""
+    m = FENCE_OPEN_RE.match(line)
+    if m and not (m.group(1)[0] == "`" and "`" in line[m.end(1) :]):
+        return m
+    return None
+
+
+def _table_row(line: str) -> List[str]:
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if line.endswith("|") and not line.endswith("\\|"):
+        line = line[:-1]
+    return [cell.strip() for cell in CELL_SPLIT_RE.split(line)]
+
+
+def parse(text: str) -> Document:
+    """Parse Markdown into a Document in one pass over its lines."""
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    blocks: List[Block] = []
+    para: List[str] = []
+    para_at = 0
+    items: List[list] = []  # [indent, ordered, lines, content indent, body lines, body fence marker]
+    list_at = 0
+    quote: List[str] = []
+    quote_at = 0
+    raw: List[str] = []
+    raw_at = 0
+    table: Optional[List[List[str]]] = None
+    table_at = 0
+    fence = None  # (marker, lang, offset, lines)
+    blank = False
+
+    def flush_para():
+        if para:
+            blocks.append(Block("paragraph", para_at, text="\n".join(para)))
+            para.clear()
+
+    def flush_list():
+        if items:
+            blocks.append(
+                Block(
+                    "list",
+                    list_at,
+                    items=[
+                        ListItem(i, o, " ".join(lines), parse("\n".join(body)) if body else None)
+                        for i, o, lines, _, body, _ in items
+                    ],
+                )
+            )
+            items.clear()
+
+    def flush_quote():
+        if quote:
+            blocks.append(Block("quote", quote_at, children=parse("\n".join(quote))))
+            quote.clear()
+
+    def flush_table():
+        nonlocal table
+        if table is not None:
+            blocks.append(Block("table", table_at, items=table))
+            table = None
+
+    def flush_all():
+        flush_para()
+        flush_list()
+        flush_quote()
+        flush_table()
+
+    def item_body(line):
+        """Add line to the last list item's body if it belongs there: a
+        fence indented to the item's content column (and everything up to its
+        close), or indented text after a blank line. The content indent is
+        stripped. Nested list items stay in the flat item list."""
+        item = items[-1]
+        content, body = item[3], item[4]
+        expanded = line.expandtabs(4)
+        stripped = expanded.lstrip()
+        width = len(expanded) - len(stripped)
+        if item[5] is not None:
+            body.append(expanded[min(width, content) :])
+            if _closes_fence(stripped, item[5]):
+                item[5] = None
+            return True
+        if not stripped:
+            if body:
+                body.append("")
+            return False
+        if width < content:
+            return False
+        inner = expanded[content:]
+        if inner[:1] in "`~" and (m := _opens_fence(inner)):
+            item[5] = m.group(1)
+        elif LIST_ITEM_RE.match(line) or not (blank or body):
+            return False
+        body.append(inner)
+        return True
+
+    offset = 0
+    for line in text.split("\n"):
+        start = offset
+        offset += len(line) + 1
+
+        if fence is not None:
+            marker, lang, fence_at, lines = fence
+            if _closes_fence(line, marker):
+                code = "\n".join(lines) + "\n" if lines else ""
+                blocks.append(Block("code", fence_at, lang=lang.lower(), text=code))
+                fence = None
+            else:
+                lines.append(line)
+            continue
+
+        if raw:
+            if line.strip():
+                raw.append(line)
+                continue
+            blocks.append(Block("html", raw_at, text="\n".join(raw)))
+            raw.clear()
+
+        if items and item_body(line):
+            blank = False
+            continue
+
+        if not line.strip():
+            flush_para()
+            flush_quote()
+            flush_table()
+            blank = True
+            continue
+
+        # Only lines starting with a marker character can open a block.
+        lead = line.lstrip()[:1]
+        marker = lead in BLOCK_MARKERS
+        if marker and (m := _opens_fence(line)):
+            flush_all()
+            fence = (m.group(1), m.group(2), start, [])
+        elif para and lead in "=-" and SETEXT_RE.match(line):
+            level = 1 if lead == "=" else 2
+            blocks.append(Block("heading", para_at, level=level, text=" ".join(para)))
+            para.clear()
+        elif lead == "#" and (m := HEADING_RE.match(line)):
+            flush_all()
+            blocks.append(Block("heading", start, level=len(m.group(1)), text=m.group(2) or ""))
+        elif marker and RULE_RE.match(line):
+            flush_all()
+            blocks.append(Block("rule", start))
+        elif lead == ">" and (m := QUOTE_RE.match(line)):
+            if not quote:
+                flush_all()
+                quote_at = start
+            quote.append(m.group(1))
+        elif marker and (m := LIST_ITEM_RE.match(line)):
+            flush_para()
+            flush_quote()
+            flush_table()
+            if not items:
+                list_at = start
+            indent = len(m.group(1).expandtabs(4))
+            # Continuation blocks line up with the item's text: one to four
+            # spaces after the marker (one if the item is empty or code-indented).
+            gap = len(line[m.end(2) :].expandtabs(4)) - len((m.group(3) or "").expandtabs(4))
+            content = indent + len(m.group(2)) + (gap if m.group(3) and 1 <= gap <= 4 else 1)
+            items.append([indent, m.group(2)[0].isdigit(), [(m.group(3) or "").strip()], content, [], None])
+        elif items and (not blank or line[:1] in " \t"):
+            # Continuation (lazy, or indented after a blank line) of the last item.
+            items[-1][2].append(line.strip())
+        elif table is not None and "|" in line:
+            table.append(_table_row(line))
+        elif len(para) == 1 and "|" in para[0] and "|" in line and TABLE_SEP_RE.match(line):
+            table, table_at = [_table_row(para[0])], para_at
+            para.clear()
+        elif quote and not blank:
+            quote.append(line)
+        elif not para and lead == "<" and HTML_BLOCK_RE.match(line):
+            flush_all()
+            raw_at = start
+            raw.append(line)
+        else:
+            flush_list()
+            flush_quote()
+            flush_table()
+            if not para:
+                para_at = start
+            para.append(line.strip())
+        blank = False
+
+    if fence is not None:
+        # An unclosed fence runs to the end of the file. Its language is
+        # dropped: the "code" is usually the rest of the prose, and
+        # highlighting it would cost more than rendering everything else
+        # (Highlighter.replace_fences leaves such fences unhighlighted too).
+        marker, lang, fence_at, lines = fence
+        blocks.append(Block("code", fence_at, text="\n".join(lines) + "\n" if lines else ""))
+    if raw:
+        blocks.append(Block("html", raw_at, text="\n".join(raw)))
+    flush_all()
+    return Document(text, blocks)
+
+
+def as_document(content: Union[str, Document]) -> Document:
+    return content if isinstance(content, Document) else parse(content)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Change-aware directory mirroring for the snapshot generators.
+Files are compared by size and then sha256 before anything is written, bytes
+are copied with shutil.copyfile (sendfile/fcopyfile under the hood) into a
+temp file that is renamed into place, and mirrored-type files in the
+destination that are gone upstream are deleted, whether or not an earlier
+run recorded them. Untouched files keep their bytes and mtimes.
+NO EXTERNAL DEPENDENCIES - pure Python stdlib.
+"""
+
+import hashlib
+import os
+import shutil
+from collections import namedtuple
+
+from output_writer import AtomicFile
+
+MirrorResult = namedtuple("MirrorResult", "names copied unchanged removed")
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+def same_file(src, dst):
+    """True if dst exists with exactly src's bytes."""
+    try:
+        if os.path.getsize(src) != os.path.getsize(dst):
+            return False
+    except OSError:
+        return False
+    return file_digest(src) == file_digest(dst)
+
+
+def copy_atomic(src, dst):
+    with AtomicFile(dst, mode=None) as out:
+        shutil.copyfile(src, out.tmp)
+
+
+def mirror_files(src_dir, dst_dir, suffix=".md", keep=()):
+    """Mirror src_dir/*<suffix> into dst_dir.
+
+    Every *<suffix> file in dst_dir that is not upstream is an orphan and is
+    deleted, except names in keep (files the caller writes itself). Files
+    with other suffixes are left alone."""
+    os.makedirs(dst_dir, exist_ok=True)
+    names, copied, unchanged = [], [], []
+    if os.path.isdir(src_dir):
+        for item in sorted(os.listdir(src_dir)):
+            src_path = os.path.join(src_dir, item)
+            if item in keep or not item.endswith(suffix) or not os.path.isfile(src_path):
+                continue
+            names.append(item)
+            dst_path = os.path.join(dst_dir, item)
+            if same_file(src_path, dst_path):
+                unchanged.append(item)
+            else:
+                copy_atomic(src_path, dst_path)
+                copied.append(item)
+
+    removed = []
+    current = set(names)
+    for item in sorted(os.listdir(dst_dir)):
+        path = os.path.join(dst_dir, item)
+        if item.endswith(suffix) and item not in current and item not in keep and os.path.isfile(path):
+            os.unlink(path)
+            removed.append(item)
+    return MirrorResult(names, copied, unchanged, removed)
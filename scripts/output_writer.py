@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Atomic write-if-changed output layer for the site generators.
+Content is streamed into a temp file beside the target while being hashed,
+then compared with the existing file; only real changes are renamed into
+place, so unchanged outputs keep their bytes and mtimes and git sees no
+churn. Every write is recorded, and whether anything changed can be
+exported to GitHub Actions as a step output.
+AtomicFile is the one temp-file-and-rename helper; the mirror and the disk
+caches use it too, and prune_cache keeps those caches to their current
+version and recently used entries.
+NO EXTERNAL DEPENDENCIES - pure Python stdlib.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import stat
+import tempfile
+import threading
+import time
+
+
+def _current_umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+_UMASK = _current_umask()
+# Cache entries unused for this long are dropped by prune_cache. Hits touch
+# their entry, so anything a scheduled build still renders stays.
+CACHE_MAX_AGE = 30 * 24 * 3600
+
+
+def file_mode(path):
+    """Permissions a rewrite of path should get: the existing file's, or the
+    umask default for a new file (mkstemp alone would leave it 0600)."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+class AtomicFile:
+    """Write path via a temp file beside it.
+
+        with AtomicFile(path, "w", encoding="utf-8") as out:
+            out.file.write(text)
+
+    On a clean exit the temp file replaces path (with file_mode(path)); on an
+    exception, or with out.commit set to False, it is removed instead.
+    mode=None leaves the temp file unopened for the caller to fill by name
+    (out.tmp), e.g. with shutil.copyfile."""
+
+    def __init__(self, path, mode="wb", encoding=None):
+        self.path = path
+        self.commit = True
+        self.file = None
+        fd, self.tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".tmp-")
+        try:
+            os.chmod(self.tmp, file_mode(path))
+            if mode is None:
+                os.close(fd)
+            else:
+                self.file = os.fdopen(fd, mode, encoding=encoding)
+        except BaseException:
+            if self.file is None:
+                os.close(fd)
+            self._discard()
+            raise
+
+    def _discard(self):
+        try:
+            os.unlink(self.tmp)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        replaced = False
+        try:
+            if self.file is not None:
+                self.file.close()
+            if exc_type is None and self.commit:
+                os.replace(self.tmp, self.path)
+                replaced = True
+        finally:
+            if not replaced:
+                self._discard()
+        return False
+
+
+def prune_cache(cache_dir, keep, max_age=CACHE_MAX_AGE):
+    """Remove everything in cache_dir except the keep version directory
+    (older versions, and entries from before versioned dirs), then every
+    entry in keep not used for max_age seconds."""
+    for name in os.listdir(cache_dir):
+        if name == keep:
+            continue
+        path = os.path.join(cache_dir, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+    cutoff = time.time() - max_age
+    with os.scandir(os.path.join(cache_dir, keep)) as entries:
+        for entry in entries:
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+def _digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+def write_if_changed(path, content, encoding="utf-8"):
+    """Write content (str, bytes or an iterable of str) to path unless the
+    file already holds exactly those bytes. Returns True if path changed."""
+    return _write_if_changed(path, content, encoding)[0]
+
+
+def _write_if_changed(path, content, encoding):
+    """write_if_changed, also returning the content's size in bytes."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    if isinstance(content, str):
+        content = (content,)
+    elif isinstance(content, bytes):
+        content = (content,)
+
+    h = hashlib.sha256()
+    size = 0
+    with AtomicFile(path) as out:
+        for chunk in content:
+            data = chunk if isinstance(chunk, bytes) else chunk.encode(encoding)
+            h.update(data)
+            size += len(data)
+            out.file.write(data)
+        try:
+            unchanged = os.path.getsize(path) == size and _digest(path) == h.digest()
+        except OSError:
+            unchanged = False
+        out.commit = not unchanged
+    return not unchanged, size
+
+
+def same_content(path, content, encoding="utf-8"):
+    """True if path holds exactly content (str or bytes)."""
+    data = content.encode(encoding) if isinstance(content, str) else content
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, "rb") as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+
+def read_stamp(path, stamp_re):
+    """Return the first stamp_re group found in an existing file, or None."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            m = re.search(stamp_re, f.read())
+    except (OSError, UnicodeDecodeError):
+        return None
+    return m.group(1) if m else None
+
+
+class OutputWriter:
+    """Records which outputs a run actually changed."""
+
+    def __init__(self, root=None):
+        self.root = root
+        self.changed = []
+        self.unchanged = []
+        self.bytes_written = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def thread_bytes_written(self):
+        """Bytes this thread has written so far (for per-stage accounting)."""
+        return getattr(self._local, "bytes_written", 0)
+
+    def _label(self, path):
+        return os.path.relpath(path, self.root) if self.root else path
+
+    def record(self, path, changed):
+        (self.changed if changed else self.unchanged).append(self._label(path))
+        return changed
+
+    def write(self, path, content, encoding="utf-8"):
+        changed, size = _write_if_changed(path, content, encoding)
+        if changed:
+            self._local.bytes_written = self.thread_bytes_written() + size
+            with self._lock:
+                self.bytes_written += size
+        return self.record(path, changed)
+
+    def write_json(self, path, obj, **dump_kwargs):
+        dump_kwargs.setdefault("indent", 2)
+        return self.write(path, json.dumps(obj, **dump_kwargs))
+
+    def write_stamped(self, path, render, stamp, stamp_re):
+        """Write render(stamp), keeping the stamp already in path if that is
+        the only difference. render is called with a stamp and returns the
+        content; stamp_re's first group locates the stamp in the old file."""
+        old_stamp = read_stamp(path, stamp_re)
+        if old_stamp and old_stamp != stamp and same_content(path, render(old_stamp)):
+            return self.record(path, False)
+        return self.write(path, render(stamp))
+
+    def summary(self):
+        return f"{len(self.changed)} changed, {len(self.unchanged)} unchanged"
+
+    def export_github_output(self):
+        """Append changed=true|false to $GITHUB_OUTPUT when running in Actions."""
+        path = os.environ.get("GITHUB_OUTPUT")
+        if path:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(f"changed={'true' if self.changed else 'false'}\n")
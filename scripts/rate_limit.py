@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Rate-limit-aware request scheduler for the GitHub API.
+Tracks X-RateLimit-Remaining / X-RateLimit-Reset from every response, keeps a
+per-repo reserve so one long history can't starve the repos still waiting,
+and retries secondary rate limits, 5xx and network errors with jittered
+exponential backoff (honouring Retry-After when present).
+Pure Python stdlib.
+"""
+from __future__ import annotations
+
+import http.client
+import random
+import threading
+import time
+from typing import Callable, Iterable, Optional, TypeVar
+
+from http_client import HTTPError, Response
+
+T = TypeVar("T")
+
+DEFAULT_MAX_RETRIES = 4
+# Long enough for a secondary-limit pause (SECONDARY_LIMIT_DELAY plus jitter).
+DEFAULT_MAX_WAIT = 90.0
+# Requests held back for every repo that hasn't started yet (info + first page).
+DEFAULT_RESERVE_PER_REPO = 2
+# GitHub asks clients to wait at least a minute after a secondary rate limit
+# that comes without Retry-After.
+SECONDARY_LIMIT_DELAY = 60.0
+
+
+class RateLimitExhausted(Exception):
+    """The quota can't cover this request within the allowed wait."""
+
+
+class RateLimitScheduler:
+    def __init__(
+        self,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        max_wait: float = DEFAULT_MAX_WAIT,
+        reserve_per_repo: int = DEFAULT_RESERVE_PER_REPO,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.reserve_per_repo = reserve_per_repo
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self.clock = clock
+        self.remaining: Optional[int] = None
+        self.limit: Optional[int] = None
+        self.reset: Optional[float] = None
+        self.retries = 0
+        self.waited = 0.0
+        self._unstarted: set = set()
+        self._lock = threading.Lock()
+
+    # -- quota bookkeeping -------------------------------------------------
+
+    def plan(self, repos: Iterable[str]) -> None:
+        """Register the repos that will share the quota this run."""
+        with self._lock:
+            self._unstarted = set(repos)
+
+    def begin(self, repo: str) -> None:
+        with self._lock:
+            self._unstarted.discard(repo)
+
+    def observe(self, response: Response) -> None:
+        remaining = response.header("x-ratelimit-remaining")
+        reset = response.header("x-ratelimit-reset")
+        limit = response.header("x-ratelimit-limit")
+        if remaining is None or reset is None:
+            return
+        try:
+            remaining_n, reset_at = int(remaining), float(reset)
+        except ValueError:
+            return
+        with self._lock:
+            if limit is not None and limit.isdigit():
+                self.limit = int(limit)
+            # Responses from parallel workers arrive out of order; within one
+            # window the lowest count is the freshest.
+            if self.reset == reset_at and self.remaining is not None:
+                self.remaining = min(self.remaining, remaining_n)
+            elif self.reset is None or reset_at >= self.reset:
+                self.remaining, self.reset = remaining_n, reset_at
+
+    def _acquire(self) -> None:
+        while True:
+            with self._lock:
+                if self.remaining is None:
+                    return
+                headroom = self.remaining - self.reserve_per_repo * len(self._unstarted)
+                if headroom > 0:
+                    self.remaining -= 1
+                    return
+                wait = (self.reset or 0) - self.clock() + 1
+            if wait <= 0:
+                # The window has rolled over; the next response resets the count.
+                with self._lock:
+                    self.remaining = None
+                continue
+            if wait > self.max_wait:
+                raise RateLimitExhausted(
+                    f"rate limit budget spent ({self.remaining} left), resets in {wait:.0f}s"
+                )
+            self._pause(wait)
+
+    def _pause(self, seconds: float) -> None:
+        with self._lock:
+            self.waited += seconds
+        self.sleep(seconds)
+
+    def _backoff(self, attempt: int) -> float:
+        cap = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return random.uniform(self.base_delay / 2, cap)
+
+    # -- request execution -------------------------------------------------
+
+    def _retry_delay(self, err: HTTPError, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying err, or None if it isn't retryable."""
+        resp = err.response
+        retry_after = resp.header("retry-after")
+        if resp.status in (403, 429):
+            if retry_after and retry_after.isdigit():
+                return float(retry_after)
+            if resp.header("x-ratelimit-remaining") == "0":
+                wait = float(resp.header("x-ratelimit-reset") or 0) - self.clock() + 1
+                if wait > self.max_wait:
+                    raise RateLimitExhausted(f"primary rate limit hit, resets in {wait:.0f}s") from err
+                return max(wait, 0)
+            if b"secondary rate limit" in resp.body.lower():
+                # Our own guess, not the server's: never let it exceed max_wait
+                # and turn a retryable limit into RateLimitExhausted.
+                return min(SECONDARY_LIMIT_DELAY + self._backoff(attempt), self.max_wait)
+            return None
+        if resp.status >= 500:
+            if retry_after and retry_after.isdigit():
+                return float(retry_after)
+            return self._backoff(attempt)
+        return None
+
+    def run(self, send: Callable[[], Response]) -> Response:
+        """Call send() under the quota, retrying transient failures."""
+        attempt = 0
+        while True:
+            self._acquire()
+            try:
+                resp = send()
+            except HTTPError as err:
+                self.observe(err.response)
+                delay = self._retry_delay(err, attempt)
+                if delay is None or attempt >= self.max_retries:
+                    raise
+                if delay > self.max_wait:
+                    raise RateLimitExhausted(f"asked to wait {delay:.0f}s by {err.response.url}") from err
+            except (OSError, http.client.HTTPException):
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                self.observe(resp)
+                return resp
+            attempt += 1
+            with self._lock:
+                self.retries += 1
+            self._pause(delay)
+
+    def summary(self) -> str:
+        if self.remaining is None:
+            return f"rate limit: unknown, {self.retries} retries"
+        return (
+            f"rate limit: {self.remaining}/{self.limit or '?'} left, "
+            f"{self.retries} retries, {self.waited:.0f}s waited"
+        )
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Shared pieces of the projects/ page build, used by build_site.py (and the
+generate_snapshots_ci.py / generate_all_snapshots.py wrappers around it) and
+by bench_snapshots.py: the project config, doc mirroring, page inputs
+(features, tech stack), the input hash and the build cache.
+NO EXTERNAL DEPENDENCIES - pure Python stdlib.
+"""
+
+import hashlib
+import json
+import os
+
+from md_document import Document, as_document
+from mirror import mirror_files
+from tech_stack import default_matcher
+
+OUTPUT_FILENAME = "index.html"
+# Each project's docs are also rendered to docs/<name>.html, starting here.
+DOCS_HREF = "docs/README.html"
+# Committed alongside the outputs (projects/) so it survives between CI runs.
+BUILD_CACHE_NAME = ".build-cache.json"
+# README fallbacks, in order, relative to the repo root.
+README_CANDIDATES = ("README.md", "readme.md", "docs/README.md", "docs/readme.md")
+
+# Project configurations
+PROJECTS = {
+    "plaudblender": {
+        "repo_name": "PlaudBlender",
+        "title": "PlaudBlender",
+        "tagline": "Plaud voice recordings into a searchable knowledge graph with Gemini AI, Qdrant, Dash UI, and MCP tools.",
+        "app_store_url": None,
+        "github_url": "https://github.com/Gunnarguy/PlaudBlender",
+        "accent_color": "#14b8a6",
+    },
+    "openresponses": {
+        "repo_name": "OpenResponses",
+        "title": "OpenResponses",
+        "tagline": "Third app. Rebuilt on Responses after it became obvious OpenAssistant would age out on older endpoints.",
+        "app_store_url": "https://apps.apple.com/app/apple-store/id6757338355?pt=127101782&ct=Portfolio_Traffic&mt=8",
+        "github_url": "https://github.com/Gunnarguy/OpenResponses",
+        "accent_color": "#6366f1",
+        "story_cards": [
+            {
+                "title": "Why it exists",
+                "description": "I did not want the first app stranded on older endpoints.",
+            },
+            {
+                "title": "How I built it",
+                "description": "I kept the old app open in one window, the new one in another, and rebuilt the core flow on the Responses stack.",
+            },
+            {
+                "title": "What changed",
+                "description": "This one passed App Review on the first submission.",
+            },
+        ],
+    },
+    "openintelligence": {
+        "repo_name": "OpenIntelligence",
+        "title": "OpenIntelligence",
+        "tagline": "Fourth app. Built because I wanted an offline version of the same document workflow on Apple's Foundation Models path.",
+        "app_store_url": "https://apps.apple.com/app/apple-store/id6756559175?pt=127101782&ct=Portfolio_Traffic&mt=8",
+        "github_url": "https://github.com/Gunnarguy/OpenIntelligence",
+        "accent_color": "#10b981",
+        "story_cards": [
+            {
+                "title": "What kicked it off",
+                "description": "WWDC25 made Foundation Models real for third-party apps, so I wanted to try an offline version of the same document workflow on Apple's on-device model path.",
+            },
+            {
+                "title": "What got hard",
+                "description": "Apple's public on-device sessions are capped at 4096 tokens, and that same budget has to cover instructions, retrieved evidence, tool and schema overhead, and the answer itself. That is what pushed me into a recursive multi-session reasoning loop.",
+            },
+            {
+                "title": "Why it matters",
+                "description": "It is the same document problem again, just in an offline, on-device form.",
+            },
+        ],
+    },
+    "opencone": {
+        "repo_name": "OpenCone",
+        "title": "OpenCone",
+        "tagline": "Second app. Built when bigger document sets started stressing the earlier workflow and I wanted more retrieval control.",
+        "app_store_url": "https://apps.apple.com/app/apple-store/id6744467668?pt=127101782&ct=Portfolio_Traffic&mt=8",
+        "github_url": "https://github.com/Gunnarguy/OpenCone",
+        "accent_color": "#f59e0b",
+        "story_cards": [
+            {
+                "title": "Why it exists",
+                "description": "I wanted to work with larger document sets without the earlier flow falling apart.",
+            },
+            {
+                "title": "How I built it",
+                "description": "Same basic process as OpenAssistant, now with Pinecone docs, indexes, namespaces, and embeddings layered on top.",
+            },
+            {
+                "title": "Why it mattered",
+                "description": "It was the point where retrieval stopped being theoretical and turned into a real app.",
+            },
+        ],
+    },
+    "openassistant": {
+        "repo_name": "OpenAssistant",
+        "title": "OpenAssistant",
+        "tagline": "First app. Built because I wanted a better way to work through docs on iPhone.",
+        "app_store_url": "https://apps.apple.com/app/apple-store/id6692613772?pt=127101782&ct=Portfolio_Traffic&mt=8",
+        "github_url": "https://github.com/Gunnarguy/OpenAssistant",
+        "accent_color": "#8b5cf6",
+        "story_cards": [
+            {
+                "title": "Why it exists",
+                "description": "I wanted a better document workflow on iPhone than the official app gave me.",
+            },
+            {
+                "title": "How I built it",
+                "description": "Copied docs, Playground threads, red Xcode errors, rebuilds.",
+            },
+            {
+                "title": "Why it matters",
+                "description": "It is still the foundation for everything that followed.",
+            },
+        ],
+    },
+}
+
+
+def extract_features(content):
+    """Extract features from the README's Features section (text or parsed Document)."""
+    return as_document(content).features(limit=8)
+
+
+def extract_tech_stack(*texts):
+    """Extract tech/tools mentioned, most frequent first. A parsed Document is
+    scanned as plain text (no markup or link targets), a str as is."""
+    return default_matcher().rank((t.plain_text() if isinstance(t, Document) else t for t in texts), limit=10)
+
+
+def mirrored_docs(output_dir):
+    """Doc names the previous run mirrored, as recorded in manifest.json."""
+    try:
+        with open(os.path.join(output_dir, "manifest.json"), "r", encoding="utf-8") as f:
+            return json.load(f).get("docs", [])
+    except (FileNotFoundError, ValueError):
+        return []
+
+
+def copy_docs(repo_path, output_dir):
+    """Mirror markdown docs from repo, skipping identical files and removing
+    any .md in the output that is not upstream. docs/README.md is written
+    separately."""
+    return mirror_files(os.path.join(repo_path, "docs"), os.path.join(output_dir, "docs"), keep={"README.md"})
+
+
+def input_hash(config, readme_path, readme, docs, version):
+    """Hash everything a project's output depends on.
+
+    readme_path is relative to the repo root; docs maps doc path -> text."""
+    h = hashlib.sha256()
+    h.update(version.encode())
+    h.update(json.dumps(config, sort_keys=True).encode())
+    h.update(readme_path.encode())
+    h.update(b"\0" + readme.encode("utf-8"))
+    for path in sorted(docs):
+        h.update(b"\0" + path.encode("utf-8") + b"\0" + docs[path].encode("utf-8"))
+    return h.hexdigest()
+
+
+def outputs_present(output_dir):
+    return all(
+        os.path.isfile(os.path.join(output_dir, name))
+        for name in (OUTPUT_FILENAME, "manifest.json", os.path.join("docs", "README.md"), DOCS_HREF)
+    )
+
+
+def load_build_cache(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_build_cache(cache, writer, path):
+    writer.write(path, json.dumps(cache, indent=2, sort_keys=True) + "\n")
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tech-stack keyword matcher shared by the snapshot generators.
+All keywords and aliases are compiled into one case-insensitive regex and
+every document is scanned once, so cost grows with corpus size, not
+keywords x documents. Matches need letter boundaries ("Swift" no longer hits
+"SwiftUI", "RAG" no longer hits "storage"), and keywords that are also
+ordinary English words must match their exact case ("Render" the host, not
+"render" the verb), checked after the match.
+Those common-word keywords only count in prose: inside fenced code (mermaid
+labels like "Render Output", identifiers like "combine(") they are too often
+just words, while unambiguous names ("import SwiftUI", "FROM python") still
+count there.
+Pure Python stdlib.
+"""
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+TECH_KEYWORDS = [
+    "SwiftUI",
+    "Swift",
+    "Combine",
+    "OpenAI",
+    "Pinecone",
+    "RAG",
+    "Vision",
+    "CoreML",
+    "Apple Intelligence",
+    "MCP",
+    "Computer Use",
+    "Code Interpreter",
+    "MVVM",
+    "EventKit",
+    "FastAPI",
+    "Python",
+    "Gemini",
+    "Qdrant",
+    "Dash",
+    "Cytoscape",
+    "Docker",
+    "MapKit",
+    "LinkedIn OAuth",
+    "Notion",
+    "SQLite",
+    "SQLAlchemy",
+    "Render",
+]
+
+# Other spellings that count as a hit for the canonical keyword.
+TECH_ALIASES: Dict[str, List[str]] = {
+    "CoreML": ["Core ML"],
+    "RAG": ["retrieval-augmented generation", "retrieval augmented generation"],
+    "MCP": ["Model Context Protocol"],
+    "Apple Intelligence": ["Foundation Models"],
+    "FastAPI": ["Fast API"],
+    "Dash": ["Plotly Dash"],
+}
+
+# Keywords that are also common words; these only match with their exact case,
+# and never inside fenced code.
+CASE_SENSITIVE = {"Swift", "Combine", "Vision", "Dash", "Render", "Notion"}
+
+FENCE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})", re.MULTILINE)
+
+
+def split_fenced(text: str) -> Iterator[Tuple[str, bool]]:
+    """Yield (segment, is_code) for text, fenced code blocks marked as code.
+
+    An unclosed fence runs to the end of the text, as in Markdown."""
+    if "```" not in text and "~~~" not in text:
+        yield text, False
+        return
+    pos, opener = 0, None
+    for m in FENCE_RE.finditer(text):
+        fence = m.group(1)
+        if opener is None:
+            yield text[pos:m.start()], False
+            pos, opener = m.start(), fence
+        elif fence[0] == opener[0] and len(fence) >= len(opener):
+            end = text.find("\n", m.end())
+            end = len(text) if end < 0 else end
+            yield text[pos:end], True
+            pos, opener = end, None
+    yield text[pos:], opener is not None
+
+
+class TechMatcher:
+    """Single-pass, boundary-aware matcher for a keyword list plus aliases."""
+
+    def __init__(
+        self,
+        keywords: Sequence[str] = TECH_KEYWORDS,
+        aliases: Optional[Dict[str, List[str]]] = None,
+        case_sensitive: Iterable[str] = CASE_SENSITIVE,
+    ):
+        self.keywords = list(keywords)
+        aliases = TECH_ALIASES if aliases is None else aliases
+        case_sensitive = set(case_sensitive)
+        self._order = {kw: i for i, kw in enumerate(self.keywords)}
+
+        # (surface form, canonical); longest first so overlapping phrases
+        # ("Plotly Dash" vs "Dash") resolve to the longer one.
+        terms = [(kw, kw) for kw in self.keywords]
+        terms += [(alias, kw) for kw in self.keywords for alias in aliases.get(kw, ())]
+        terms.sort(key=lambda t: len(t[0]), reverse=True)
+
+        # Matched text (whitespace collapsed) -> canonical keyword: exact case
+        # for the common-word keywords, lower-cased for everything else.
+        self._exact: Dict[str, str] = {}
+        self._folded: Dict[str, str] = {}
+        parts = []
+        for surface, canonical in terms:
+            parts.append(re.escape(surface).replace(r"\ ", r"\s+"))
+            if canonical in case_sensitive:
+                self._exact[surface] = canonical
+            else:
+                self._folded[surface.lower()] = canonical
+        # Same as a (?<![A-Za-z]) letter boundary, but trying \b first keeps
+        # the per-offset cost close to one plain alternation.
+        self._regex = re.compile(
+            r"(?:\b|(?<=[_0-9]))(?:" + "|".join(parts) + r")(?![A-Za-z])", re.IGNORECASE
+        )
+
+    def count(self, texts: Iterable[str]) -> Counter:
+        """Hits per canonical keyword across all texts (Markdown or plain)."""
+        counts: Counter = Counter()
+        exact, folded = self._exact, self._folded
+        for text in texts:
+            for segment, is_code in split_fenced(text):
+                for m in self._regex.finditer(segment):
+                    found = m.group()
+                    if not found.isalpha():
+                        found = " ".join(found.split())
+                    canonical = folded.get(found.lower())
+                    if canonical is None and not is_code:
+                        canonical = exact.get(found)
+                    if canonical is not None:
+                        counts[canonical] += 1
+        return counts
+
+    def rank(self, texts: Iterable[str], limit: Optional[int] = 10) -> List[str]:
+        """Keywords found in texts, most frequent first (ties keep list order)."""
+        counts = self.count(texts)
+        ranked = sorted(counts, key=lambda kw: (-counts[kw], self._order[kw]))
+        return ranked[:limit] if limit else ranked
+
+
+_default_matcher: Optional[TechMatcher] = None
+
+
+def default_matcher() -> TechMatcher:
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = TechMatcher()
+    return _default_matcher
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Checks for the md_document parser: list item bodies, link destinations and
+raw HTML sanitizing.
+Run from scripts/: python3 -m unittest test_md_document
+"""
+import unittest
+
+import md_document
+
+
+class ListItemBodyTest(unittest.TestCase):
+    def test_fence_indented_under_item_stays_in_the_list(self):
+        doc = md_document.parse(
+            "1. **Clone:**\n"
+            "   ```bash\n"
+            "   git clone repo\n"
+            "   - not an item\n"
+            "   ```\n"
+            "2. **Run:**\n"
+            "   - nested\n"
+        )
+        self.assertEqual([b.kind for b in doc.blocks], ["list"])
+        first, second, nested = doc.blocks[0].items
+        self.assertEqual(second.text, "**Run:**")
+        self.assertEqual(nested.indent, 3)
+        code = first.children.blocks
+        self.assertEqual([b.kind for b in code], ["code"])
+        self.assertEqual(code[0].lang, "bash")
+        self.assertEqual(code[0].text, "git clone repo\n- not an item\n")
+        self.assertIn("<li><strong>Clone:</strong><pre><code", doc.to_html())
+
+    def test_indented_paragraph_after_blank_line_is_a_child_block(self):
+        doc = md_document.parse("- first\n\n  more about first\n  still more\n- second\n\nafter\n")
+        self.assertEqual([b.kind for b in doc.blocks], ["list", "paragraph"])
+        first = doc.blocks[0].items[0]
+        self.assertEqual(first.text, "first")
+        self.assertEqual(first.children.blocks[0].text, "more about first\nstill more")
+        self.assertIn("more about first", doc.plain_text())
+        self.assertIn("<li>first<p>more about first\nstill more</p></li><li>second", doc.to_html())
+
+    def test_lazy_continuation_joins_the_item_text(self):
+        doc = md_document.parse("- first\ncontinued\n- second\n")
+        self.assertEqual([i.text for i in doc.blocks[0].items], ["first continued", "second"])
+        self.assertIsNone(doc.blocks[0].items[0].children)
+
+
+class LinkDestinationTest(unittest.TestCase):
+    def test_balanced_parentheses_stay_in_the_url(self):
+        tokens = md_document.parse_inline("[x](https://en.wikipedia.org/wiki/Foo_(bar)) after")
+        self.assertEqual(tokens[0], ("open", "a", "https://en.wikipedia.org/wiki/Foo_(bar)"))
+        self.assertEqual(tokens[-1], ("text", " after"))
+
+    def test_link_inside_parentheses(self):
+        tokens = md_document.parse_inline("(see [docs](a/b.md))")
+        self.assertIn(("open", "a", "a/b.md"), tokens)
+        self.assertEqual(md_document.plain_text(tokens), "(see docs)")
+
+    def test_title_and_escaped_paren(self):
+        tokens = md_document.parse_inline('[a](u\\(v "T (x)") [b](w)')
+        self.assertEqual(tokens[0], ("open", "a", "u\\(v"))
+        self.assertIn(("open", "a", "w"), tokens)
+
+    def test_unbalanced_destination_is_not_a_link(self):
+        tokens = md_document.parse_inline("[a](b(c) [d](e)")
+        self.assertEqual([t for t in tokens if t[0] == "open"], [("open", "a", "e")])
+
+
+class RawHtmlTest(unittest.TestCase):
+    def test_disallowed_tags_are_escaped_and_attributes_dropped(self):
+        out = md_document.parse('<div align="center" onclick="x()"><script>alert(1)</script></div>\n').to_html()
+        self.assertEqual(out, '<div align="center">&lt;script&gt;alert(1)&lt;/script&gt;</div>')
+
+    def test_urls_in_raw_html_go_through_the_scheme_check(self):
+        out = md_document.parse('Hi <a href="java\tscript:x()">a</a> <img src="logo.png">\n').to_html(
+            link=lambda url: url if ":" in url else "/site/" + url
+        )
+        self.assertEqual(out, '<p>Hi <a href="#">a</a> <img src="/site/logo.png"></p>')
+
+    def test_markdown_links_with_unsafe_schemes_are_dead(self):
+        self.assertEqual(md_document.parse("[a](data:text/html,x)\n").to_html(), '<p><a href="#">a</a></p>')
+
+
+if __name__ == "__main__":
+    unittest.main()
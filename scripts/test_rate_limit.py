@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Checks for the rate-limit scheduler against the local fake GitHub server.
+Run from scripts/: python3 -m unittest test_rate_limit
+"""
+import unittest
+
+from fake_github import FakeGitHub
+from http_client import HttpClient
+from rate_limit import SECONDARY_LIMIT_DELAY, RateLimitScheduler
+
+
+class SecondaryLimitTest(unittest.TestCase):
+    def setUp(self):
+        self.fake = FakeGitHub.synthetic(5, repos=["OpenClinic"])
+        self.base = self.fake.start()
+        self.client = HttpClient()
+        self.url = f"{self.base}/repos/{self.fake.owner}/OpenClinic"
+        self.sleeps = []
+
+    def tearDown(self):
+        self.client.close()
+        self.fake.stop()
+
+    def test_secondary_limit_without_retry_after_sleeps_then_succeeds(self):
+        self.fake.inject("/repos/", 403)
+        scheduler = RateLimitScheduler(sleep=self.sleeps.append)
+        resp = scheduler.run(lambda: self.client.get(self.url))
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(len(self.sleeps), 1)
+        self.assertGreaterEqual(self.sleeps[0], SECONDARY_LIMIT_DELAY)
+        self.assertLessEqual(self.sleeps[0], scheduler.max_wait)
+        self.assertEqual(scheduler.retries, 1)
+
+    def test_secondary_limit_delay_is_capped_at_max_wait(self):
+        self.fake.inject("/repos/", 403)
+        scheduler = RateLimitScheduler(max_wait=5, sleep=self.sleeps.append)
+        resp = scheduler.run(lambda: self.client.get(self.url))
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(self.sleeps, [5])
+
+    def test_retry_after_is_honoured(self):
+        self.fake.inject("/repos/", 403, retry_after=2)
+        scheduler = RateLimitScheduler(sleep=self.sleeps.append)
+        self.assertEqual(scheduler.run(lambda: self.client.get(self.url)).status, 200)
+        self.assertEqual(self.sleeps, [2.0])
+
+
+if __name__ == "__main__":
+    unittest.main()